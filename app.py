@@ -1,9 +1,15 @@
 import streamlit as st
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from pyecharts import options as opts
 from pyecharts.charts import Line
 from streamlit_echarts import st_echarts
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import SKIP_HEADER
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 from datetime import datetime, time, timedelta
@@ -13,6 +19,19 @@ import re
 from urllib.parse import urljoin, urlparse
 import subprocess
 import json
+import codecs
+import os
+import threading
+import time as pytime
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 디코더 사용
+    orjson = None
 
 # 페이지 설정
 st.set_page_config(
@@ -193,6 +212,47 @@ KST_TZ = pytz.timezone('Asia/Seoul')
 KRX_OPEN_TIME = time(9, 0, 0)
 KRX_CLOSE_TIME = time(15, 30, 0)
 
+# 공유 HTTP 커넥션 풀 설정 (호스트별 풀 크기 상한, connect/read 타임아웃, 재시도 백오프)
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF_SEC = 0.3
+NAVER_HTTP_TIMEOUT = (3.05, 10)
+
+# 네이버 지수 분봉 API (전체 조회 / 증분 조회 페이지 크기)
+NAVER_INDEX_TIME_URL = "https://stock.naver.com/api/domestic/indexSise/time"
+NAVER_FULL_PAGE_SIZE = 500
+NAVER_INCREMENTAL_PAGE_SIZE = 10
+NAVER_MAX_PAGES = 20
+INTRADAY_TICK_STORE_MAX_SERIES = 16
+INDEX_VALUE_COLUMNS = ("nowVal", "changeVal", "changeRate")
+SESSION_OPEN_MINUTE = KRX_OPEN_TIME.hour * 60 + KRX_OPEN_TIME.minute
+NAVER_MAX_CONCURRENCY = 6
+VALID_DATA_MAX_SESSIONS = 10
+EMPTY_SESSION_DATE_CACHE_MAX = 256
+# 빈 응답은 일시 오류일 수 있어 네거티브 캐시도 이 시간 후 다시 조회 (휴장일은 거래일 달력이 먼저 제외)
+EMPTY_SESSION_DATE_TTL_SEC = 600
+
+# 세션 간 공유 분봉 스냅샷 캐시 (1분 봉 주기 + 반영 지연, 장 마감 후 확정)
+INTRADAY_SNAPSHOT_REFRESH_LAG_SEC = 5
+INTRADAY_SNAPSHOT_FINAL_MARGIN_MIN = 10
+INTRADAY_SNAPSHOT_MAX_ENTRIES = 64
+# 마감 후 빈 응답은 일시 오류일 수 있어 짧게만 보관 (휴장 확정은 EmptySessionDateCache 담당)
+INTRADAY_EMPTY_SNAPSHOT_TTL_SEC = 60
+
+# 장중 분봉 백그라운드 폴러 (프로세스당 1개)
+MARKET_POLL_INDEX_TYPES = ("KOSPI", "KOSDAQ")
+
+# 로컬 디스크 캐시 (마감된 거래일 분봉 아카이브: intraday/date=YYYYMMDD/{지수}.parquet)
+APP_CACHE_DIR = os.environ.get(
+    "DAILYSTOCK_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+INTRADAY_ARCHIVE_DIR = os.path.join(APP_CACHE_DIR, "intraday")
+# 확정된 KRX 일별 응답 캐시 ({엔드포인트}/{basDd}.json)
+KRX_PAYLOAD_CACHE_DIR = os.path.join(APP_CACHE_DIR, "krx")
+KRX_PAYLOAD_CACHE_MAX_MEMORY = 64
+
 @st.cache_data(show_spinner=False, ttl=3600)
 def get_kr_holiday_dates(years):
     return sorted({day.strftime("%Y-%m-%d") for day in holidays.KR(years=years).keys()})
@@ -205,6 +265,35 @@ def is_krx_trading_day(date_kst, kr_holiday_set=None):
         kr_holiday_set = set(get_kr_holiday_dates(years))
     return date_kst.strftime("%Y-%m-%d") not in kr_holiday_set
 
+def iter_previous_krx_trading_dates(start_date, count, kr_holiday_set=None):
+    """start_date(포함)부터 과거로 KRX 거래일을 최대 count개 반환"""
+    if kr_holiday_set is None:
+        years = (start_date.year - 1, start_date.year, start_date.year + 1)
+        kr_holiday_set = set(get_kr_holiday_dates(years))
+
+    trading_dates = []
+    candidate_date = start_date
+    for _ in range(370):
+        if len(trading_dates) >= count:
+            break
+        if is_krx_trading_day(candidate_date, kr_holiday_set):
+            trading_dates.append(candidate_date)
+        candidate_date -= timedelta(days=1)
+    return trading_dates
+
+def get_next_krx_trading_date(date_kst, kr_holiday_set=None):
+    """date_kst 다음 KRX 거래일 반환"""
+    if kr_holiday_set is None:
+        years = (date_kst.year - 1, date_kst.year, date_kst.year + 1)
+        kr_holiday_set = set(get_kr_holiday_dates(years))
+
+    candidate_date = date_kst + timedelta(days=1)
+    for _ in range(370):
+        if is_krx_trading_day(candidate_date, kr_holiday_set):
+            break
+        candidate_date += timedelta(days=1)
+    return candidate_date
+
 def get_next_krx_open_datetime(now_kst, kr_holiday_set=None):
     candidate_date = now_kst.date()
     if kr_holiday_set is None:
@@ -422,19 +511,692 @@ def render_market_countdown(context):
     html = html_template.replace("__CONFIG__", json.dumps(config, ensure_ascii=False))
     components.html(html, height=62)
 
-def fetch_index_data(index_type, today_str):
-    """네이버 증권 API를 통해 특정 지수(KOSPI/KOSDAQ) 데이터를 가져옴"""
-    url = f"https://stock.naver.com/api/domestic/indexSise/time?koreaIndexType={index_type}&thistime={today_str}&startIdx=0&pageSize=500"
+class CountingHTTPAdapter(HTTPAdapter):
+    """호스트별 요청 수와 신규 연결(TCP+TLS 핸드셰이크) 수를 집계하는 HTTPAdapter"""
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self._request_counts = {}
+        self._handshake_counts = {}
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": self._counting_pool_cls(HTTPConnectionPool),
+            "https": self._counting_pool_cls(HTTPSConnectionPool),
+        }
+
+    def _counting_pool_cls(self, pool_cls):
+        adapter = self
+
+        class CountingConnection(pool_cls.ConnectionCls):
+            def connect(conn):
+                super().connect()
+                adapter._bump(adapter._handshake_counts, f"{pool_cls.scheme}://{conn.host}")
+
+        return type(pool_cls.__name__, (pool_cls,), {"ConnectionCls": CountingConnection})
+
+    def _bump(self, counts, host):
+        with self._stats_lock:
+            counts[host] = counts.get(host, 0) + 1
+
+    def send(self, request, *args, **kwargs):
+        parsed = urlparse(request.url)
+        self._bump(self._request_counts, f"{parsed.scheme}://{parsed.hostname}")
+        return super().send(request, *args, **kwargs)
+
+    def get_stats(self):
+        with self._stats_lock:
+            hosts = sorted(set(self._request_counts) | set(self._handshake_counts))
+            return [
+                {
+                    "host": host,
+                    "requests": self._request_counts.get(host, 0),
+                    "new_connections": self._handshake_counts.get(host, 0),
+                    "reused": max(0, self._request_counts.get(host, 0) - self._handshake_counts.get(host, 0)),
+                }
+                for host in hosts
+            ]
+
+def build_pooled_adapter(max_retries):
+    # pool_block=True: 호스트별 동시 커넥션 수를 pool_maxsize로 제한
+    return CountingHTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=max_retries,
+        pool_block=True,
+    )
+
+def mount_adapter(session, adapter):
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_shared_http_session():
+    """프로세스 전역에서 공유하는 keep-alive 커넥션 풀 세션"""
+    retry = Retry(
+        total=HTTP_RETRY_TOTAL,
+        connect=HTTP_RETRY_TOTAL,
+        read=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_RETRY_BACKOFF_SEC,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    return mount_adapter(requests.Session(), build_pooled_adapter(retry))
+
+def get_http_pool_stats():
+    """공유 세션과 KRX 세션 풀의 호스트별 요청 수, 신규 핸드셰이크 수, 커넥션 재사용 수 집계"""
+    adapters = list(get_shared_http_session().adapters.values()) + get_krx_session_pool().adapters()
+    merged = {}
+    for adapter in {id(a): a for a in adapters}.values():
+        if not isinstance(adapter, CountingHTTPAdapter):
+            continue
+        for entry in adapter.get_stats():
+            total = merged.setdefault(entry["host"], {"host": entry["host"], "requests": 0, "new_connections": 0, "reused": 0})
+            for field in ("requests", "new_connections", "reused"):
+                total[field] += entry[field]
+    return [merged[host] for host in sorted(merged)]
+
+class SingleFlight:
+    """같은 키의 동시 호출을 1회의 실제 호출로 합치고 결과를 공유하는 single-flight 그룹"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._stats = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        key가 같은 동시 호출 중 첫 호출(leader)만 fn을 실행하고 나머지는 그 결과/예외를 공유합니다.
+        leader가 스크립트 중단/재실행(StopException/RerunException 등 BaseException)으로 끊기면
+        해당 예외는 leader에게만 다시 올리고, 기다리던 호출은 직접 다시 시도합니다.
+        """
+        namespace = key[0] if isinstance(key, tuple) else str(key)
+        while True:
+            with self._lock:
+                stats = self._stats.setdefault(namespace, {"namespace": namespace, "executed": 0, "coalesced": 0})
+                call = self._in_flight.get(key)
+                is_leader = call is None
+                if is_leader:
+                    call = {"done": threading.Event(), "result": None, "error": None}
+                    self._in_flight[key] = call
+                    stats["executed"] += 1
+                else:
+                    stats["coalesced"] += 1
+
+            if is_leader:
+                break
+            call["done"].wait()
+            if call["error"] is None:
+                return call["result"]
+            if isinstance(call["error"], Exception):
+                raise call["error"]
+
+        try:
+            call["result"] = fn(*args, **kwargs)
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            call["done"].set()
+
+    def get_stats(self):
+        with self._lock:
+            return [dict(stats) for stats in self._stats.values()]
+
+@st.cache_resource(show_spinner=False)
+def get_upstream_single_flight():
+    """네이버/KRX 상류 호출을 합치는 프로세스 전역 single-flight 그룹"""
+    return SingleFlight()
+
+def make_script_thread_pool(max_workers, thread_name_prefix):
+    """
+    현재 스크립트 실행 컨텍스트를 워커 스레드에 연결하는 ThreadPoolExecutor (st.cache_data/st.secrets 사용 가능).
+    스크립트 밖(백그라운드 갱신 스레드)에서 만들면 연결할 컨텍스트가 없으므로 필요한 객체를 미리 받아 써야 합니다.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+
+    def attach_ctx():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix, initializer=attach_ctx)
+
+class IntradayTickStore:
+    """(지수, 날짜)별 누적 분봉 틱과 마지막 thistime을 보관하는 프로세스 전역 저장소"""
+
+    def __init__(self, max_series=INTRADAY_TICK_STORE_MAX_SERIES):
+        self._lock = threading.Lock()
+        self._series = OrderedDict()
+        self._max_series = max_series
+
+    def get_last_thistime(self, key):
+        with self._lock:
+            series = self._series.get(key)
+            return series["last_thistime"] if series else None
+
+    def get_rows(self, key):
+        with self._lock:
+            series = self._series.get(key)
+            return self._sorted_rows(series) if series else []
+
+    def replace(self, key, rows):
+        with self._lock:
+            self._series[key] = {"rows": {}, "last_thistime": None}
+            return self._merge(key, rows)
+
+    def append(self, key, rows):
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = {"rows": {}, "last_thistime": None}
+            return self._merge(key, rows)
+
+    def _merge(self, key, rows):
+        series = self._series[key]
+        self._series.move_to_end(key)
+        for row in rows:
+            thistime = str(row.get("thistime") or "")
+            if not thistime:
+                continue
+            series["rows"][thistime] = row
+            if series["last_thistime"] is None or thistime > series["last_thistime"]:
+                series["last_thistime"] = thistime
+        while len(self._series) > self._max_series:
+            self._series.popitem(last=False)
+        return self._sorted_rows(series)
+
+    @staticmethod
+    def _sorted_rows(series):
+        return [series["rows"][t] for t in sorted(series["rows"])]
+
+@st.cache_resource(show_spinner=False)
+def get_intraday_tick_store():
+    """프로세스 전역 분봉 틱 저장소"""
+    return IntradayTickStore()
+
+def decode_json(raw):
+    """사용 가능한 가장 빠른 JSON 디코더로 응답 본문을 파싱"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def request_index_ticks(index_type, date_str, start_idx, page_size):
+    """네이버 지수 분봉 API 한 페이지 조회"""
+    params = {
+        "koreaIndexType": index_type,
+        "thistime": date_str,
+        "startIdx": start_idx,
+        "pageSize": page_size,
+    }
+    response = get_shared_http_session().get(NAVER_INDEX_TIME_URL, params=params, timeout=NAVER_HTTP_TIMEOUT)
+    response.raise_for_status()
+    data = decode_json(response.content)
+    if not isinstance(data, list):
+        return []
+    return [row for row in data if isinstance(row, dict)]
+
+def thistime_to_minute_of_day(thistime):
+    """thistime(YYYYMMDDHHMM...) 문자열을 자정 기준 분 단위로 변환 (파싱 불가 시 None)"""
+    text = str(thistime or "")
+    if len(text) < 12 or not text[8:12].isdigit():
+        return None
+    return int(text[8:10]) * 60 + int(text[10:12])
+
+def format_minute_of_day(minute):
+    return f"{int(minute) // 60:02d}:{int(minute) % 60:02d}"
+
+def build_index_frame(rows):
+    """분봉 행을 thistime 순으로 정렬된 타입 컬럼(minute: int64, 값: float64) DataFrame으로 1회 변환"""
+    if not rows:
+        return pd.DataFrame()
+
+    frame = pd.DataFrame({"thistime": pd.Series([str(row.get("thistime") or "") for row in rows], dtype=object)})
+    valid = frame["thistime"].str.match(r"^\d{12}")
+    hhmm = pd.to_numeric(frame["thistime"].str.slice(8, 12).where(valid), errors="coerce")
+    frame["minute"] = (hhmm // 100) * 60 + hhmm % 100
+    for column in INDEX_VALUE_COLUMNS:
+        raw = pd.Series([row.get(column) for row in rows], dtype=object).astype(str)
+        frame[column] = pd.to_numeric(raw.str.replace(",", "", regex=False), errors="coerce").astype(np.float64)
+
+    frame = frame.dropna(subset=["minute"])
+    frame["minute"] = frame["minute"].astype(np.int64)
+    return frame.sort_values("thistime", kind="stable").reset_index(drop=True)
+
+def estimate_index_tick_total(page, date_str, now_kst=None):
+    """첫 페이지의 시간 범위와 밀도로 당일 전체 행 수를 추정"""
+    minutes = [m for m in (thistime_to_minute_of_day(row.get("thistime")) for row in page) if m is not None]
+    if not minutes:
+        return len(page)
+
+    session_start = SESSION_OPEN_MINUTE
+    session_end = KRX_CLOSE_TIME.hour * 60 + KRX_CLOSE_TIME.minute
+    now_kst = now_kst or datetime.now(KST_TZ)
+    if now_kst.strftime("%Y%m%d") == date_str:
+        session_end = min(session_end, now_kst.hour * 60 + now_kst.minute)
+    session_end = max(session_end, max(minutes))
+    session_start = min(session_start, min(minutes))
+
+    covered_minutes = max(minutes) - min(minutes) + 1
+    session_minutes = session_end - session_start + 1
+    return int(np.ceil(len(page) * session_minutes / covered_minutes))
+
+def fetch_all_index_ticks(index_type, date_str, page_size=NAVER_FULL_PAGE_SIZE):
+    """첫 페이지로 전체 행 수를 추정한 뒤 나머지 startIdx 페이지를 병렬 조회해 하나의 시리즈로 병합"""
+    first_page = request_index_ticks(index_type, date_str, 0, page_size)
+    if len(first_page) < page_size:
+        return first_page
+
+    rows_by_time = {}
+    def merge(page):
+        for row in page:
+            thistime = str(row.get("thistime") or "")
+            if thistime:
+                rows_by_time[thistime] = row
+
+    merge(first_page)
+    estimated_pages = -(-estimate_index_tick_total(first_page, date_str) // page_size)
+    next_page_idx = 1
+    last_page_full = True
+    with make_script_thread_pool(NAVER_MAX_CONCURRENCY, "naver-page") as executor:
+        # 추정치가 부족하면(마지막 페이지가 가득 참) 다음 묶음을 이어서 조회
+        while last_page_full and next_page_idx < NAVER_MAX_PAGES:
+            batch_end = min(max(estimated_pages, next_page_idx + 1), NAVER_MAX_PAGES)
+            page_indices = list(range(next_page_idx, batch_end))
+            futures = [
+                executor.submit(request_index_ticks, index_type, date_str, page_idx * page_size, page_size)
+                for page_idx in page_indices
+            ]
+            pages = [future.result() for future in futures]
+            for page in pages:
+                merge(page)
+            last_page_full = len(pages[-1]) >= page_size
+            next_page_idx = batch_end
+
+    return [rows_by_time[t] for t in sorted(rows_by_time)]
+
+def fetch_index_ticks(index_type, date_str):
+    """마지막으로 본 thistime 이후 틱만 받아 누적 시리즈에 붙임 (공백/날짜 변경 시 전체 재조회)"""
+    store = get_intraday_tick_store()
+    key = (index_type, date_str)
+    last_thistime = store.get_last_thistime(key)
+
+    if last_thistime is not None:
+        page = request_index_ticks(index_type, date_str, 0, NAVER_INCREMENTAL_PAGE_SIZE)
+        page_times = [str(row.get("thistime") or "") for row in page]
+        if not page:
+            return store.get_rows(key)
+        # 페이지에 이미 본 틱이 포함되어 있으면 누락 없이 이어진 것으로 판단
+        # (최신 페이지가 last_thistime보다 과거면 정렬이 다르므로 전체 재조회)
+        if min(page_times) <= last_thistime <= max(page_times):
+            # 마지막 봉은 같은 thistime으로 값이 갱신될 수 있으므로 함께 덮어씀
+            newer = [row for row, t in zip(page, page_times) if t >= last_thistime]
+            return store.append(key, newer)
+
+    rows = fetch_all_index_ticks(index_type, date_str)
+    return store.replace(key, rows)
+
+class IntradaySnapshot(NamedTuple):
+    """세션 간 공유되는 지수 분봉 스냅샷 (df는 읽기 전용으로 취급)"""
+    index_type: str
+    date_str: str
+    df: pd.DataFrame
+    fetched_at: datetime
+    expires_at: Optional[datetime]
+    version: int = 0
+
+class IntradaySnapshotCache:
+    """(지수, 날짜)별 분봉 스냅샷을 프로세스 전역에서 공유하는 캐시"""
+
+    def __init__(self, max_entries=INTRADAY_SNAPSHOT_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._version = 0
+
+    def get(self, key, now_kst):
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None:
+                return None
+            if snapshot.expires_at is not None and now_kst >= snapshot.expires_at:
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def get_latest(self, key):
+        """만료 여부와 관계없이 마지막으로 게시된 스냅샷 반환"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, snapshot):
+        key = (snapshot.index_type, snapshot.date_str)
+        with self._lock:
+            self._version += 1
+            snapshot = snapshot._replace(version=self._version)
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+@st.cache_resource(show_spinner=False)
+def get_intraday_snapshot_cache():
+    """프로세스 전역 분봉 스냅샷 캐시"""
+    return IntradaySnapshotCache()
+
+class EmptySessionDateCache:
+    """마감 후에도 분봉이 비어 있던 날짜(임시 휴장 등)를 ttl_sec 동안 기억하는 네거티브 캐시"""
+
+    def __init__(self, max_entries=EMPTY_SESSION_DATE_CACHE_MAX, ttl_sec=EMPTY_SESSION_DATE_TTL_SEC):
+        self._lock = threading.Lock()
+        self._dates = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_sec = ttl_sec
+
+    def __contains__(self, date_str):
+        with self._lock:
+            added_at = self._dates.get(date_str)
+            if added_at is None:
+                return False
+            if pytime.monotonic() - added_at >= self._ttl_sec:
+                del self._dates[date_str]
+                return False
+            return True
+
+    def add(self, date_str):
+        with self._lock:
+            self._dates[date_str] = pytime.monotonic()
+            self._dates.move_to_end(date_str)
+            while len(self._dates) > self._max_entries:
+                self._dates.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def get_empty_session_date_cache():
+    """프로세스 전역 빈 날짜 네거티브 캐시"""
+    return EmptySessionDateCache()
+
+def is_intraday_session_final(date_str, now_kst):
+    """장 마감 후 확정 여유 시간까지 지나 분봉이 더 바뀌지 않는 날짜인지 여부"""
+    session_date = datetime.strptime(date_str, "%Y%m%d").date()
+    final_dt = KST_TZ.localize(datetime.combine(session_date, KRX_CLOSE_TIME)) + timedelta(
+        minutes=INTRADAY_SNAPSHOT_FINAL_MARGIN_MIN
+    )
+    return now_kst >= final_dt
+
+def get_intraday_snapshot_expiry(date_str, now_kst, is_empty=False):
+    """스냅샷 만료 시각 계산 (장 마감이 지난 날짜는 None=영구 보관, 단 빈 응답은 짧게만 보관)"""
+    if is_intraday_session_final(date_str, now_kst):
+        if is_empty:
+            return now_kst + timedelta(seconds=INTRADAY_EMPTY_SNAPSHOT_TTL_SEC)
+        return None
+    # 다음 1분 봉이 확정되는 시점까지만 유효
+    return now_kst.replace(second=0, microsecond=0) + timedelta(minutes=1, seconds=INTRADAY_SNAPSHOT_REFRESH_LAG_SEC)
+
+def get_intraday_archive_path(index_type, date_str):
+    return os.path.join(INTRADAY_ARCHIVE_DIR, f"date={date_str}", f"{index_type}.parquet")
+
+def read_intraday_archive(index_type, date_str):
+    """마감된 거래일 분봉 아카이브 읽기 (없거나 손상되면 None)"""
+    path = get_intraday_archive_path(index_type, date_str)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:
+        return None
+    if "minute" not in df.columns:
+        df = build_index_frame(df.to_dict("records"))
+    return df
+
+def write_intraday_archive(index_type, date_str, df):
+    """마감된 거래일 분봉을 1회 기록 (임시 파일에 쓴 뒤 교체해 부분 기록 방지)"""
+    path = get_intraday_archive_path(index_type, date_str)
+    if os.path.exists(path):
+        return
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # 아카이브는 최선 노력: 실패해도 네트워크 경로로 계속 동작
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def refresh_index_snapshot(index_type, date_str, cache=None):
+    """지수 분봉을 조회해 새 스냅샷으로 게시 (동시 호출은 1회로 합치고, 실패 시 캐시하지 않음)"""
+    cache = cache or get_intraday_snapshot_cache()
+    return get_upstream_single_flight().do(
+        ("naver-index", index_type, date_str),
+        _refresh_index_snapshot,
+        index_type,
+        date_str,
+        cache,
+    )
+
+def _refresh_index_snapshot(index_type, date_str, cache):
+    now_kst = datetime.now(KST_TZ)
+    rows = fetch_index_ticks(index_type, date_str)
+    df = build_index_frame(rows)
+    snapshot = cache.put(IntradaySnapshot(
+        index_type=index_type,
+        date_str=date_str,
+        df=df,
+        fetched_at=now_kst,
+        expires_at=get_intraday_snapshot_expiry(date_str, now_kst, is_empty=df.empty),
+    ))
+    # 15:30 마감이 확정된 거래일은 디스크에 보관해 이후 재방문 시 네트워크 호출 생략
+    if snapshot.expires_at is None and not snapshot.df.empty:
+        write_intraday_archive(index_type, date_str, snapshot.df)
+    return snapshot
+
+def load_index_frame(index_type, date_str):
+    """지수 분봉 DataFrame과 오류 메시지를 반환 (워커 스레드에서 호출 가능하도록 st 호출 없음)"""
+    cache = get_intraday_snapshot_cache()
+    key = (index_type, date_str)
+    snapshot = cache.get(key, datetime.now(KST_TZ))
+    if snapshot is None and get_market_data_poller().is_polling(index_type, date_str):
+        # 폴러가 갱신 중인 키는 네트워크를 기다리지 않고 마지막 게시본을 사용
+        snapshot = cache.get_latest(key)
+    if snapshot is not None:
+        return snapshot.df, None
+
+    archived_df = read_intraday_archive(index_type, date_str)
+    if archived_df is not None:
+        snapshot = cache.put(IntradaySnapshot(
+            index_type=index_type,
+            date_str=date_str,
+            df=archived_df,
+            fetched_at=datetime.now(KST_TZ),
+            expires_at=None,
+        ))
+        return snapshot.df, None
+
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        if not data:
-            return pd.DataFrame()
-        return pd.DataFrame(data)
+        snapshot = refresh_index_snapshot(index_type, date_str, cache)
     except Exception as e:
-        st.error(f"{index_type} 데이터를 가져오는 중 오류 발생: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), f"{index_type} 데이터를 가져오는 중 오류 발생: {e}"
+    return snapshot.df, None
+
+def is_krx_polling_window(now_kst, kr_holiday_set=None):
+    """장중(09:00~15:30)과 마감 확정 여유 시간 동안 True"""
+    if not is_krx_trading_day(now_kst.date(), kr_holiday_set):
+        return False
+    open_dt = KST_TZ.localize(datetime.combine(now_kst.date(), KRX_OPEN_TIME))
+    close_dt = KST_TZ.localize(datetime.combine(now_kst.date(), KRX_CLOSE_TIME))
+    return open_dt <= now_kst < close_dt + timedelta(minutes=INTRADAY_SNAPSHOT_FINAL_MARGIN_MIN)
+
+class MarketDataPoller:
+    """장중 KOSPI/KOSDAQ 분봉을 1분 봉 주기로 갱신해 버전 스냅샷으로 게시하는 백그라운드 폴러"""
+
+    def __init__(self, cache, index_types=MARKET_POLL_INDEX_TYPES):
+        self._cache = cache
+        self._index_types = tuple(index_types)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="market-data-poller", daemon=True)
+        self._polling_date = None
+        self.poll_count = 0
+        self.last_poll_at = None
+        self.last_error = None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def is_polling(self, index_type, date_str):
+        with self._lock:
+            return (
+                self._thread.is_alive()
+                and index_type in self._index_types
+                and self._polling_date == date_str
+            )
+
+    def get_status(self):
+        with self._lock:
+            return {
+                "alive": self._thread.is_alive(),
+                "polling_date": self._polling_date or "-",
+                "poll_count": self.poll_count,
+                "last_poll_at": self.last_poll_at.strftime("%H:%M:%S") if self.last_poll_at else "-",
+                "last_error": self.last_error or "-",
+            }
+
+    def poll_once(self, now_kst):
+        date_str = now_kst.strftime("%Y%m%d")
+        errors = []
+        for index_type in self._index_types:
+            try:
+                refresh_index_snapshot(index_type, date_str, self._cache)
+            except Exception as e:
+                # 실패 시 직전 스냅샷을 유지하고 다음 주기에 재시도
+                errors.append(f"{index_type}: {e}")
+        with self._lock:
+            self._polling_date = date_str
+            self.poll_count += 1
+            self.last_poll_at = now_kst
+            self.last_error = " | ".join(errors) if errors else None
+
+    def _seconds_until_next_poll(self):
+        # 분봉 확정 직후(정각 + 반영 지연)에 맞춰 깨어남
+        now_kst = datetime.now(KST_TZ)
+        next_poll = now_kst.replace(second=0, microsecond=0) + timedelta(
+            minutes=1, seconds=INTRADAY_SNAPSHOT_REFRESH_LAG_SEC
+        )
+        return max(1.0, (next_poll - now_kst).total_seconds())
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            now_kst = datetime.now(KST_TZ)
+            try:
+                if is_krx_polling_window(now_kst):
+                    self.poll_once(now_kst)
+                else:
+                    with self._lock:
+                        self._polling_date = None
+            except Exception as e:
+                with self._lock:
+                    self.last_error = str(e)
+            self._stop_event.wait(self._seconds_until_next_poll())
+
+@st.cache_resource(show_spinner=False)
+def get_market_data_poller():
+    """서버 프로세스당 1개의 분봉 백그라운드 폴러를 시작"""
+    return MarketDataPoller(get_intraday_snapshot_cache()).start()
+
+KRX_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+KRX_WARMUP_URL = "https://data-dbg.krx.co.kr/"
+KRX_HEADER_PROFILES = {
+    # 브라우저 직접 URL 진입과 유사한 최소 헤더
+    "minimal": {
+        "headers": {
+            "User-Agent": KRX_USER_AGENT,
+            "Accept": "*/*",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+        },
+        "warmup": False,
+    },
+    # 브라우저 navigate 흐름과 유사한 헤더
+    "navigate": {
+        "headers": {
+            "User-Agent": KRX_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Sec-Fetch-Site": "none",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-User": "?1",
+            "Upgrade-Insecure-Requests": "1",
+        },
+        "warmup": False,
+    },
+    # 세션/쿠키 확보 후 호출
+    "session": {
+        "headers": {
+            "User-Agent": KRX_USER_AGENT,
+            "Accept": "application/json,text/plain,*/*",
+            "Referer": "https://data-dbg.krx.co.kr/",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Connection": "keep-alive",
+        },
+        "warmup": True,
+    },
+}
+KRX_TIMEOUTS = (10, 20)
+# 연속 실패 시 강등: 마지막 실패 후 KRX_PROFILE_REPROBE_SEC 동안은 시도하지 않고, 이후 짧은 타임아웃으로 1회 재탐색
+KRX_PROFILE_DEMOTE_AFTER = 3
+KRX_PROFILE_REPROBE_SEC = 600
+# 워밍업 쿠키 재사용 한도 (만료 정보가 없는 세션 쿠키 대비), 거부로 간주할 상태 코드
+KRX_SESSION_MAX_AGE_SEC = 1800
+KRX_REJECT_STATUS_CODES = (401, 403)
+# 모든 프로필 실패 시 fallback 전송 계층 (curl --http1.1 헤더 순서와 --max-time 20 재현)
+KRX_FALLBACK_TIMEOUT_SEC = 20
+# 기준일 후보 병렬 조회 워커 수
+KRX_PROBE_MAX_WORKERS = 4
+KRX_FUTURES_URL = "https://data-dbg.krx.co.kr/svc/apis/drv/fut_bydd_trd.json"
+KRX_DERIVATIVE_INDEX_URL = "https://data-dbg.krx.co.kr/svc/apis/idx/drvprod_dd_trd"
+# 대용량 KRX 응답은 이 크기 단위로 읽으며 OutBlock_1 행을 하나씩 디코딩
+KRX_STREAM_CHUNK_SIZE = 64 * 1024
+# 실패 응답 본문은 이 길이까지만 읽어 오류 메시지에 표시
+KRX_ERROR_PREVIEW_CHARS = 200
+# 엔드포인트별 회로 차단기: 연속 실패 N회 후 즉시 실패, 냉각 시간 후 1건만 복구 확인
+KRX_BREAKER_FAILURE_THRESHOLD = 3
+KRX_BREAKER_COOLDOWN_SEC = 120
+# 모든 KRX 호출(프로필 요청/워밍업/fallback)이 공유하는 토큰 버킷과 AUTH_KEY 일일 호출 예산
+KRX_PRIORITY_INTERACTIVE = "interactive"
+KRX_PRIORITY_BACKGROUND = "background"
+KRX_RATE_LIMIT_PER_SEC = 2.0
+KRX_RATE_LIMIT_BURST = 4
+KRX_RATE_LIMIT_MAX_WAIT_SEC = {KRX_PRIORITY_INTERACTIVE: 10, KRX_PRIORITY_BACKGROUND: 60}
+KRX_DAILY_CALL_BUDGET = int(os.environ.get("KRX_DAILY_CALL_BUDGET", "10000"))
+# 백그라운드 갱신은 일일 예산의 이 비율까지만 사용해 화면 조회 몫을 남김
+KRX_BACKGROUND_BUDGET_RATIO = 0.9
+# KRX OpenAPI 일별 데이터는 거래일 D의 값이 다음 거래일 08시 전후에 게시됨
+KRX_PUBLICATION_TIME = time(8, 0, 0)
+# 새 기준일이 게시될 차례인데 아직 없으면 촘촘히, 게시 예정 시각이 한참 지나면 느슨하게 재조회
+KRX_PUBLICATION_POLL_SEC = 60
+KRX_PUBLICATION_LATE_AFTER_SEC = 3 * 3600
+KRX_PUBLICATION_LATE_POLL_SEC = 1800
+KRX_LATEST_MAX_TTL_SEC = 6 * 3600
+KRX_LATEST_ERROR_TTL_SEC = 60
+KRX_CURL_HEADERS = (
+    ("User-Agent", KRX_USER_AGENT),
+    ("Accept", "*/*"),
+    ("Accept-Language", "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"),
+)
 
 def get_krx_auth_key():
     """Streamlit secret에서 KRX AUTH_KEY를 안전하게 읽음"""
@@ -451,11 +1213,26 @@ def get_krx_auth_key():
         return None, "KRX_AUTH_KEY가 설정되지 않았습니다."
     return str(auth_key), None
 
-def iter_basdd_candidates_kst():
-    """한국시간 기준 내일 포함 과거 10일까지(총 11일) YYYYMMDD 생성"""
-    seoul_tz = pytz.timezone('Asia/Seoul')
-    tomorrow = datetime.now(seoul_tz).date() + timedelta(days=1)
-    return [(tomorrow - timedelta(days=offset)).strftime("%Y%m%d") for offset in range(11)]
+def iter_basdd_candidates_kst(include_night_session=False, now_kst=None):
+    """
+    한국시간 기준 내일 포함 과거 10일(총 11일) 중 KRX 거래일만 YYYYMMDD로 생성 (최신순)
+    include_night_session=True면 각 거래일의 야간 세션이 귀속되는 다음 거래일도 포함
+    """
+    now_kst = now_kst or datetime.now(KST_TZ)
+    tomorrow = now_kst.date() + timedelta(days=1)
+    years = (tomorrow.year - 1, tomorrow.year, tomorrow.year + 1)
+    kr_holiday_set = set(get_kr_holiday_dates(years))
+
+    window = [tomorrow - timedelta(days=offset) for offset in range(11)]
+    candidate_dates = {day for day in window if is_krx_trading_day(day, kr_holiday_set)}
+    if include_night_session:
+        # 이미 시작된(오늘 이전) 야간 세션만 대상, 금요일/연휴 전날 야간 거래는 창 밖의 다음 거래일로 귀속될 수 있음
+        candidate_dates |= {
+            get_next_krx_trading_date(day, kr_holiday_set)
+            for day in list(candidate_dates)
+            if day <= now_kst.date()
+        }
+    return [day.strftime("%Y%m%d") for day in sorted(candidate_dates, reverse=True)]
 
 def extract_rows_from_krx_payload(payload):
     """KRX 응답에서 행 리스트를 방어적으로 추출"""
@@ -479,156 +1256,842 @@ def extract_rows_from_krx_payload(payload):
             rows.extend([row for row in val if isinstance(row, dict)])
     return rows
 
-def fetch_krx_rows_by_date(url, bas_dd, auth_key):
-    """지정 기준일자 KRX API 행 데이터 조회"""
-    params = {"AUTH_KEY": auth_key, "basDd": bas_dd}
-    user_agent = (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/131.0.0.0 Safari/537.36"
-    )
-    header_profiles = [
-        # 브라우저 직접 URL 진입과 유사한 최소 헤더
-        {
-            "name": "minimal",
-            "headers": {
-                "User-Agent": user_agent,
-                "Accept": "*/*",
-                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-            },
-            "warmup": False,
-        },
-        # 브라우저 navigate 흐름과 유사한 헤더
-        {
-            "name": "navigate",
-            "headers": {
-                "User-Agent": user_agent,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Sec-Fetch-Site": "none",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-User": "?1",
-                "Upgrade-Insecure-Requests": "1",
-            },
-            "warmup": False,
-        },
-        # 세션/쿠키 확보 후 호출
-        {
-            "name": "session",
-            "headers": {
-                "User-Agent": user_agent,
-                "Accept": "application/json,text/plain,*/*",
-                "Referer": "https://data-dbg.krx.co.kr/",
-                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Connection": "keep-alive",
-            },
-            "warmup": True,
-        },
-    ]
+class KrxPayloadLayoutError(ValueError):
+    """스트리밍 추출 대상 배열이 없는 응답 (전체 본문 보관)"""
 
-    last_err = None
-    last_profile = "-"
-    for profile in header_profiles:
-        for timeout_sec in (10, 20):
-            try:
-                session = requests.Session()
-                session.headers.update(profile["headers"])
+    def __init__(self, text):
+        super().__init__("KRX OutBlock_1 배열을 찾을 수 없습니다.")
+        self.text = text
 
-                if profile["warmup"]:
-                    session.get("https://data-dbg.krx.co.kr/", timeout=timeout_sec, allow_redirects=True)
+# 중첩 없는 JSON 객체 1개(문자열 내 괄호/이스케이프 허용)의 범위. 잘린 객체나 중첩 객체는 매칭되지 않음
+# 반복 구간이 서로 겹치지 않게 펼친 형태라 잘린 행에서도 역추적이 선형 (소유 한정자 없이 Python 3.11 미만 호환)
+KRX_FLAT_ROW_PATTERN = re.compile(r'\{[^{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^{}"]*)*\}')
+KRX_ROW_SEPARATOR_PATTERN = re.compile(r"[\s,]*")
 
-                response = session.get(
-                    url,
-                    params=params,
-                    timeout=timeout_sec,
-                    allow_redirects=False,
-                )
-                if response.is_redirect or response.is_permanent_redirect:
-                    redirect_url = response.headers.get("Location", "")
-                    if redirect_url:
-                        target = urljoin(url, redirect_url)
-                        parsed = urlparse(target)
-                        if parsed.scheme == "http":
-                            target = target.replace("http://", "https://", 1)
-                        response = session.get(target, timeout=timeout_sec, allow_redirects=False)
-                response.raise_for_status()
-                payload = response.json()
-                return extract_rows_from_krx_payload(payload)
-            except Exception as e:
-                last_profile = profile["name"]
-                last_err = e
+def iter_krx_outblock_rows(chunks, block_key="OutBlock_1", required_text=(), stats=None):
+    """
+    KRX 응답 본문 조각(str)을 순서대로 받아 OutBlock_1 배열의 행을 하나씩 디코딩해 반환합니다.
+    required_text가 있으면 행 원문에 모두 포함된 경우에만 디코딩하며(\\u 이스케이프 행은 항상 디코딩),
+    배열을 찾기 전까지만 본문을 보관하고 배열이 없으면 보관한 본문과 함께 KrxPayloadLayoutError를 냅니다.
+    stats(dict)를 주면 건너뛴 행을 포함해 배열에서 읽은 전체 행 수를 stats["scanned"]에 누적합니다.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("scanned", 0)
+    decoder = json.JSONDecoder()
+    key_token = f'"{block_key}"'
+    buffer = ""
+    pos = 0
+    in_array = False
+    for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        if not in_array:
+            key_at = buffer.find(key_token)
+            bracket_at = buffer.find("[", key_at + len(key_token)) if key_at >= 0 else -1
+            if bracket_at < 0:
+                continue
+            pos = bracket_at + 1
+            in_array = True
+
+        while True:
+            pos = KRX_ROW_SEPARATOR_PATTERN.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                return
+            match = KRX_FLAT_ROW_PATTERN.match(buffer, pos)
+            if match is not None:
+                row_text = match.group()
+                pos = match.end()
+                stats["scanned"] += 1
+                if required_text and "\\u" not in row_text and not all([text in row_text for text in required_text]):
+                    continue
+                yield json.loads(row_text)
                 continue
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 행이 조각 경계에서 잘렸으면 다음 조각을 이어 붙여 다시 디코딩
+                break
+            pos = end
+            stats["scanned"] += 1
+            yield row
+
+    if in_array:
+        raise ValueError(f"KRX {block_key} 배열이 끝나지 않았습니다: {buffer[pos:pos + 200]}")
+    raise KrxPayloadLayoutError(buffer)
+
+class KrxRows(list):
+    """필터를 통과한 KRX 행 리스트. scanned는 필터 전 응답 전체 행 수 (알 수 없으면 None)"""
+
+    def __init__(self, rows=(), scanned=None):
+        super().__init__(rows)
+        self.scanned = scanned
+
+def parse_krx_rows(chunks, row_filter=None):
+    """
+    KRX 응답 본문 조각에서 행 리스트(KrxRows)를 추출합니다.
+    row_filter(KRX_ROW_FILTERS 키)가 있으면 OutBlock_1을 스트리밍으로 읽으며 조건을 통과한 행만 보관하고,
+    응답 전체 행 수는 scanned로 함께 반환합니다.
+    """
+    krx_filter = KRX_ROW_FILTERS[row_filter] if row_filter else None
+    predicate = krx_filter.predicate if krx_filter else None
+    required_text = krx_filter.required_text if krx_filter else ()
+    rows = []
+    stats = {}
+    try:
+        for row in iter_krx_outblock_rows(chunks, required_text=required_text, stats=stats):
+            if isinstance(row, dict) and (predicate is None or predicate(row)):
+                rows.append(row)
+        return KrxRows(rows, scanned=stats["scanned"])
+    except KrxPayloadLayoutError as e:
+        # OutBlock_1이 없는 형태는 기존 방식으로 전체 파싱 (차단 HTML이면 여기서 ValueError)
+        rows = extract_rows_from_krx_payload(decode_json(e.text))
+    return KrxRows([row for row in rows if predicate is None or predicate(row)], scanned=len(rows))
+
+def read_krx_body_preview(response, limit=KRX_ERROR_PREVIEW_CHARS):
+    """오류 응답 본문 앞부분만 읽어 한 줄로 반환 (닫힌 응답이나 읽기 실패는 빈 문자열)"""
+    try:
+        chunk = next(response.iter_content(limit * 4), b"")
+    except Exception:
+        return ""
+    return chunk.decode(response.encoding or "utf-8", errors="replace")[:limit].replace("\n", " ")
 
-    if isinstance(last_err, requests.HTTPError) and last_err.response is not None:
-        body_preview = last_err.response.text[:200].replace("\n", " ")
-        request_err = RuntimeError(
-            f"HTTP {last_err.response.status_code}: {body_preview} "
-            f"(profile={last_profile}, 브라우저는 성공/앱은 실패 시 서버측 IP 차단 또는 봇 차단 가능)"
+def read_krx_rows_from_response(response, row_filter=None):
+    """스트리밍 응답을 KRX_STREAM_CHUNK_SIZE 단위로 읽어 행 추출 후 연결 반환"""
+    try:
+        text_decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        chunks = (text_decoder.decode(chunk) for chunk in response.iter_content(KRX_STREAM_CHUNK_SIZE))
+        return parse_krx_rows(chunks, row_filter)
+    finally:
+        response.close()
+
+class KrxRateLimitError(RuntimeError):
+    """KRX 호출 대기 시간 초과 또는 일일 호출 예산 소진"""
+
+class KrxRateLimiter:
+    """
+    프로세스 전역 KRX 토큰 버킷. 화면 조회(interactive)가 대기 중이면 백그라운드 호출은 토큰을 양보하고,
+    KST 일자별로 엔드포인트/호출 종류(profile, warmup, fallback)별 호출 수를 집계해 일일 예산을 지킵니다.
+    """
+
+    def __init__(self, rate_per_sec=KRX_RATE_LIMIT_PER_SEC, burst=KRX_RATE_LIMIT_BURST, daily_budget=KRX_DAILY_CALL_BUDGET):
+        self._cond = threading.Condition()
+        self._rate_per_sec = rate_per_sec
+        self._burst = burst
+        self._daily_budget = daily_budget
+        self._tokens = float(burst)
+        self._refilled_at = pytime.monotonic()
+        self._waiting = {KRX_PRIORITY_INTERACTIVE: 0, KRX_PRIORITY_BACKGROUND: 0}
+        self._usage_day = None
+        self._usage = {}
+        self._throttled = 0
+
+    def _refill(self, now):
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate_per_sec)
+        self._refilled_at = now
+
+    def _roll_day(self):
+        today = datetime.now(KST_TZ).strftime("%Y%m%d")
+        if self._usage_day != today:
+            self._usage_day = today
+            self._usage = {}
+
+    def _used_today(self):
+        return sum(sum(kinds.values()) for kinds in self._usage.values())
+
+    def _budget_for(self, priority):
+        if priority == KRX_PRIORITY_BACKGROUND:
+            return int(self._daily_budget * KRX_BACKGROUND_BUDGET_RATIO)
+        return self._daily_budget
+
+    def acquire(self, url, kind, priority=KRX_PRIORITY_INTERACTIVE):
+        """토큰 1개를 받을 때까지 대기 후 호출 1건을 집계 (예산 소진/대기 초과 시 KrxRateLimitError)"""
+        endpoint = urlparse(url).path.rsplit("/", 1)[-1]
+        deadline = pytime.monotonic() + KRX_RATE_LIMIT_MAX_WAIT_SEC[priority]
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._roll_day()
+                    if self._used_today() >= self._budget_for(priority):
+                        raise KrxRateLimitError(
+                            f"rate-limited: KRX 일일 호출 예산 소진 ({self._used_today()}/{self._daily_budget}, priority={priority})"
+                        )
+                    now = pytime.monotonic()
+                    self._refill(now)
+                    yield_to_interactive = (
+                        priority == KRX_PRIORITY_BACKGROUND and self._waiting[KRX_PRIORITY_INTERACTIVE] > 0
+                    )
+                    if self._tokens >= 1 and not yield_to_interactive:
+                        self._tokens -= 1
+                        kinds = self._usage.setdefault(endpoint, {})
+                        kinds[kind] = kinds.get(kind, 0) + 1
+                        return
+                    if now >= deadline:
+                        self._throttled += 1
+                        raise KrxRateLimitError(f"rate-limited: KRX 호출 대기 시간 초과 (priority={priority})")
+                    wait_sec = (1 - self._tokens) / self._rate_per_sec if self._tokens < 1 else 0.05
+                    self._cond.wait(min(wait_sec, deadline - now))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def get_stats(self):
+        with self._cond:
+            self._roll_day()
+            self._refill(pytime.monotonic())
+            used = self._used_today()
+            return {
+                "day": self._usage_day,
+                "used": used,
+                "budget": self._daily_budget,
+                "remaining": max(0, self._daily_budget - used),
+                "tokens": round(self._tokens, 2),
+                "waiting_interactive": self._waiting[KRX_PRIORITY_INTERACTIVE],
+                "waiting_background": self._waiting[KRX_PRIORITY_BACKGROUND],
+                "throttled": self._throttled,
+                "endpoints": [
+                    {
+                        "endpoint": endpoint,
+                        "profile": kinds.get("profile", 0),
+                        "warmup": kinds.get("warmup", 0),
+                        "fallback": kinds.get("fallback", 0),
+                        "total": sum(kinds.values()),
+                    }
+                    for endpoint, kinds in sorted(self._usage.items())
+                ],
+            }
+
+@st.cache_resource(show_spinner=False)
+def get_krx_rate_limiter():
+    """프로세스 전역 KRX 호출 제한기"""
+    return KrxRateLimiter()
+
+class KrxProfileSelector:
+    """엔드포인트 호스트별로 헤더 프로필/타임아웃 성공 이력을 학습해 시도 순서를 정하는 선택기"""
+
+    def __init__(self, profile_names=None, timeouts=KRX_TIMEOUTS):
+        self._lock = threading.Lock()
+        self._profile_names = list(profile_names or KRX_HEADER_PROFILES)
+        self._timeouts = tuple(timeouts)
+        self._preferred = {}
+        self._stats = {}
+
+    def _get_stats(self, host, profile_name):
+        return self._stats.setdefault((host, profile_name), {
+            "attempts": 0,
+            "successes": 0,
+            "consecutive_failures": 0,
+            "latency_total": 0.0,
+            "last_ok_timeout": None,
+            "last_attempt_at": 0.0,
+            "last_failure_at": 0.0,
+        })
+
+    def _is_demoted(self, stats, now):
+        """강등 상태 (재탐색 대기 중) 여부"""
+        return (
+            stats["consecutive_failures"] >= KRX_PROFILE_DEMOTE_AFTER
+            and now - stats["last_failure_at"] < KRX_PROFILE_REPROBE_SEC
         )
-    else:
-        request_err = last_err
 
-    # requests가 WAF에 차단될 때 curl이 통과하는 경우가 있어 fallback 시도
+    def ordered_attempts(self, host):
+        """
+        (프로필, 타임아웃) 시도 순서: 마지막 성공 조합 → 정상 프로필 → 재탐색 시점이 된 강등 프로필(짧은 타임아웃만).
+        재탐색 대기 중인 강등 프로필은 제외합니다.
+        """
+        now = pytime.monotonic()
+        with self._lock:
+            preferred = self._preferred.get(host)
+            healthy = []
+            reprobe = []
+            for profile_name in self._profile_names:
+                stats = self._get_stats(host, profile_name)
+                if self._is_demoted(stats, now):
+                    continue
+                if stats["consecutive_failures"] >= KRX_PROFILE_DEMOTE_AFTER:
+                    reprobe.append((profile_name, stats))
+                else:
+                    healthy.append((profile_name, stats))
+
+            attempts = []
+            if preferred is not None:
+                attempts.append(preferred)
+            for profile_name, stats in healthy:
+                timeouts = list(self._timeouts)
+                if stats["last_ok_timeout"] in timeouts:
+                    timeouts.remove(stats["last_ok_timeout"])
+                    timeouts.insert(0, stats["last_ok_timeout"])
+                attempts.extend((profile_name, timeout_sec) for timeout_sec in timeouts)
+            for profile_name, _ in reprobe:
+                attempts.append((profile_name, self._timeouts[0]))
+
+        return list(dict.fromkeys(attempts))
+
+    def record(self, host, profile_name, timeout_sec, ok, latency_sec):
+        with self._lock:
+            stats = self._get_stats(host, profile_name)
+            stats["attempts"] += 1
+            stats["latency_total"] += latency_sec
+            stats["last_attempt_at"] = pytime.monotonic()
+            if ok:
+                stats["successes"] += 1
+                stats["consecutive_failures"] = 0
+                stats["last_ok_timeout"] = timeout_sec
+                # fallback 전송 계층은 지표만 기록하고 시도 순서에는 포함하지 않음
+                if profile_name in self._profile_names:
+                    self._preferred[host] = (profile_name, timeout_sec)
+            else:
+                stats["consecutive_failures"] += 1
+                stats["last_failure_at"] = stats["last_attempt_at"]
+                if self._preferred.get(host, (None,))[0] == profile_name:
+                    self._preferred.pop(host, None)
+
+    def get_metrics(self):
+        now = pytime.monotonic()
+        with self._lock:
+            metrics = []
+            for (host, profile_name), stats in self._stats.items():
+                if not stats["attempts"]:
+                    continue
+                metrics.append({
+                    "host": host,
+                    "profile": profile_name,
+                    "attempts": stats["attempts"],
+                    "success_rate": round(stats["successes"] / stats["attempts"] * 100, 1),
+                    "avg_latency_ms": round(stats["latency_total"] / stats["attempts"] * 1000),
+                    "consecutive_failures": stats["consecutive_failures"],
+                    "preferred": self._preferred.get(host, (None,))[0] == profile_name,
+                    "demoted": self._is_demoted(stats, now),
+                })
+            return metrics
+
+@st.cache_resource(show_spinner=False)
+def get_krx_profile_selector():
+    """프로세스 전역 KRX 헤더 프로필 선택기"""
+    return KrxProfileSelector()
+
+class KrxSessionPool:
+    """헤더 프로필별로 쿠키를 유지하는 장수 KRX 세션 풀 (워밍업은 쿠키 수명당 1회)"""
+
+    def __init__(self, profiles=None):
+        self._lock = threading.Lock()
+        self._profiles = profiles or KRX_HEADER_PROFILES
+        self._entries = {}
+
+    def _get_entry(self, profile_name):
+        with self._lock:
+            entry = self._entries.get(profile_name)
+            if entry is None:
+                # 커넥션 풀(adapter)은 세션 교체 후에도 재사용, 재시도는 프로필 cascade가 담당
+                entry = {
+                    "adapter": build_pooled_adapter(0),
+                    "warmup_lock": threading.Lock(),
+                    "warmups": 0,
+                    "invalidations": 0,
+                }
+                self._reset_entry(profile_name, entry)
+                self._entries[profile_name] = entry
+            return entry
+
+    def _reset_entry(self, profile_name, entry):
+        session = mount_adapter(requests.Session(), entry["adapter"])
+        session.headers.update(self._profiles[profile_name]["headers"])
+        entry["session"] = session
+        entry["warmed_at"] = None
+
+    def _needs_warmup(self, entry):
+        if entry["warmed_at"] is None:
+            return True
+        now = pytime.time()
+        if now - entry["warmed_at"] >= KRX_SESSION_MAX_AGE_SEC:
+            return True
+        return any(cookie.expires is not None and cookie.expires <= now for cookie in entry["session"].cookies)
+
+    def acquire(self, profile_name, timeout_sec, before_warmup=None):
+        """프로필 세션 반환 (워밍업 프로필은 쿠키가 없거나 만료된 경우에만 워밍업 GET 수행)"""
+        entry = self._get_entry(profile_name)
+        if self._profiles[profile_name]["warmup"] and self._needs_warmup(entry):
+            with entry["warmup_lock"]:
+                if self._needs_warmup(entry):
+                    if before_warmup is not None:
+                        before_warmup()
+                    entry["session"].get(KRX_WARMUP_URL, timeout=timeout_sec, allow_redirects=True)
+                    entry["warmed_at"] = pytime.time()
+                    entry["warmups"] += 1
+        return entry["session"]
+
+    def invalidate(self, profile_name):
+        """요청이 거부되면 쿠키를 버리고 다음 호출에서 다시 워밍업"""
+        entry = self._get_entry(profile_name)
+        with self._lock:
+            self._reset_entry(profile_name, entry)
+            entry["invalidations"] += 1
+
+    def adapters(self):
+        with self._lock:
+            return [entry["adapter"] for entry in self._entries.values()]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                profile_name: {"warmups": entry["warmups"], "invalidations": entry["invalidations"]}
+                for profile_name, entry in self._entries.items()
+            }
+
+@st.cache_resource(show_spinner=False)
+def get_krx_session_pool():
+    """프로세스 전역 KRX 세션 풀"""
+    return KrxSessionPool()
+
+def is_krx_rejection(error):
+    """WAF/인증 거부로 보이는 실패인지 판단 (세션 쿠키 폐기 대상)"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in KRX_REJECT_STATUS_CODES
+    # 차단 페이지(HTML)가 200으로 내려오면 JSON 파싱이 실패함
+    return isinstance(error, ValueError)
+
+def fetch_krx_text_via_curl(full_url, clients=None):
+    """curl 서브프로세스로 KRX 응답 본문 조회 (비교 측정용 기존 경로)"""
     curl_cmd = [
         "curl",
         "-sS",
         "--http1.1",
         "--max-time",
-        "20",
-        "-H",
-        f"User-Agent: {user_agent}",
-        "-H",
-        "Accept: */*",
-        "-H",
-        "Accept-Language: ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-        f"{url}?AUTH_KEY={auth_key}&basDd={bas_dd}",
+        str(KRX_FALLBACK_TIMEOUT_SEC),
     ]
-    try:
-        out = subprocess.check_output(curl_cmd, stderr=subprocess.STDOUT, text=True)
-        payload = json.loads(out)
-        rows = extract_rows_from_krx_payload(payload)
-        if rows:
+    for name, value in KRX_CURL_HEADERS:
+        curl_cmd.extend(["-H", f"{name}: {value}"])
+    curl_cmd.append(full_url)
+    return subprocess.check_output(curl_cmd, stderr=subprocess.STDOUT, text=True)
+
+class CurlLikeTransport:
+    """curl --http1.1과 같은 헤더 순서/동작으로 요청하는 프로세스 내 전송 계층 (공유 커넥션 풀)"""
+
+    def __init__(self):
+        self._pool = urllib3.PoolManager(
+            num_pools=HTTP_POOL_CONNECTIONS,
+            maxsize=HTTP_POOL_MAXSIZE,
+            block=True,
+            retries=False,
+        )
+
+    def get_text(self, full_url):
+        """curl --max-time과 같이 연결부터 본문 수신까지 전체 KRX_FALLBACK_TIMEOUT_SEC 안에 끝나지 않으면 실패"""
+        deadline = pytime.monotonic() + KRX_FALLBACK_TIMEOUT_SEC
+        # Host 다음에 curl과 같은 순서로 헤더 전송, curl이 보내지 않는 Accept-Encoding은 생략
+        headers = dict(KRX_CURL_HEADERS)
+        headers["Accept-Encoding"] = SKIP_HEADER
+        response = self._pool.request(
+            "GET",
+            full_url,
+            headers=headers,
+            timeout=urllib3.Timeout(total=KRX_FALLBACK_TIMEOUT_SEC),
+            redirect=False,
+            retries=False,
+            preload_content=False,
+        )
+        chunks = []
+        try:
+            while True:
+                remaining = deadline - pytime.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Operation timed out after {KRX_FALLBACK_TIMEOUT_SEC * 1000} milliseconds")
+                # 소켓 읽기 1회도 남은 시간만큼만 대기 (바이트를 조금씩 흘리는 차단 페이지 대비)
+                sock = getattr(response.connection, "sock", None)
+                if sock is not None:
+                    sock.settimeout(remaining)
+                chunk = response.read1(KRX_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except BaseException:
+            # 다 읽지 못한 커넥션은 풀로 돌려보내지 않고 버림
+            response.close()
+            raise
+        response.release_conn()
+        # curl -sS와 동일하게 상태 코드와 관계없이 본문을 반환 (JSON 파싱 단계에서 실패 처리)
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+@st.cache_resource(show_spinner=False)
+def get_curl_like_transport():
+    """프로세스 전역 curl 호환 전송 계층"""
+    return CurlLikeTransport()
+
+def fetch_krx_text_via_inprocess(full_url, clients=None):
+    """프로세스 내 curl 호환 전송 계층으로 KRX 응답 본문 조회"""
+    transport = clients.curl_like_transport if clients is not None else get_curl_like_transport()
+    return transport.get_text(full_url)
+
+KRX_FALLBACK_TRANSPORTS = {
+    "inprocess": fetch_krx_text_via_inprocess,
+    "curl": fetch_krx_text_via_curl,
+}
+
+def get_krx_fallback_transport_name():
+    """KRX_FALLBACK_TRANSPORT 환경변수로 fallback 전송 계층 선택 (기본: inprocess)"""
+    name = os.environ.get("KRX_FALLBACK_TRANSPORT", "inprocess").strip().lower()
+    return name if name in KRX_FALLBACK_TRANSPORTS else "inprocess"
+
+class KrxPayloadCache:
+    """확정된 (엔드포인트, basDd) KRX 행을 메모리와 디스크(JSON)에 영구 보관하고, 행별 색인 카탈로그를 함께 두는 캐시"""
+
+    def __init__(self, cache_dir=KRX_PAYLOAD_CACHE_DIR, max_memory_entries=KRX_PAYLOAD_CACHE_MAX_MEMORY):
+        self._lock = threading.Lock()
+        self._cache_dir = cache_dir
+        self._memory = OrderedDict()
+        self._catalogs = OrderedDict()
+        self._max_memory_entries = max_memory_entries
+
+    def _path(self, url, bas_dd, row_filter=None):
+        endpoint_path = os.path.splitext(urlparse(url).path.strip("/"))[0]
+        endpoint = re.sub(r"[^A-Za-z0-9_-]", "_", endpoint_path)
+        file_name = f"{bas_dd}.{row_filter}.json" if row_filter else f"{bas_dd}.json"
+        return os.path.join(self._cache_dir, endpoint, file_name)
+
+    def _remember(self, key, rows):
+        with self._lock:
+            self._memory[key] = rows
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, url, bas_dd, row_filter=None):
+        key = (url, bas_dd, row_filter)
+        with self._lock:
+            rows = self._memory.get(key)
+        if rows is not None:
             return rows
-    except Exception as curl_err:
-        raise RuntimeError(f"{request_err} | curl_fallback_error={str(curl_err)[:200]}") from curl_err
 
-    raise request_err
+        path = self._path(url, bas_dd, row_filter)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception:
+            return None
+        if isinstance(payload, dict):
+            rows = KrxRows(payload.get("rows") or [], scanned=payload.get("scanned"))
+        elif isinstance(payload, list):
+            # 이전 형식(행 리스트만 저장)은 필터 전 전체 행 수를 알 수 없음
+            rows = KrxRows(payload, scanned=None if row_filter else len(payload))
+        else:
+            return None
+        self._remember(key, rows)
+        return rows
 
-def fetch_krx_futures_by_date(bas_dd, auth_key):
-    """지정 기준일자 KRX 선물 데이터 조회"""
-    return fetch_krx_rows_by_date(
-        "https://data-dbg.krx.co.kr/svc/apis/drv/fut_bydd_trd.json",
-        bas_dd,
-        auth_key,
+    def put(self, url, bas_dd, rows, row_filter=None):
+        self._remember((url, bas_dd, row_filter), rows)
+        path = self._path(url, bas_dd, row_filter)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"scanned": rows.scanned, "rows": rows}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception:
+            # 디스크 캐시는 최선 노력: 실패해도 메모리 캐시와 네트워크 경로로 계속 동작
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_catalog(self, url, bas_dd, rows, row_filter=None):
+        """페이로드 행의 색인 카탈로그 (같은 행 객체면 재사용, 메모리 항목 수 상한은 페이로드와 동일)"""
+        key = (url, bas_dd, row_filter)
+        with self._lock:
+            catalog = self._catalogs.get(key)
+        if catalog is not None and catalog.rows is rows:
+            return catalog
+
+        catalog = KrxProductCatalog(rows)
+        with self._lock:
+            self._catalogs[key] = catalog
+            self._catalogs.move_to_end(key)
+            while len(self._catalogs) > self._max_memory_entries:
+                self._catalogs.popitem(last=False)
+        return catalog
+
+@st.cache_resource(show_spinner=False)
+def get_krx_payload_cache():
+    """프로세스 전역 KRX 확정 일자 페이로드 캐시"""
+    return KrxPayloadCache()
+
+def is_krx_basdd_final(bas_dd, rows, now_kst=None):
+    """오늘 이전 기준일이고 행이 있으면 더 이상 바뀌지 않는 확정 데이터로 간주"""
+    now_kst = now_kst or datetime.now(KST_TZ)
+    return bool(rows) and bas_dd < now_kst.strftime("%Y%m%d")
+
+class KrxCircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 KRX 호출을 시도하지 않고 즉시 실패"""
+
+class KrxCircuitBreaker:
+    """KRX 엔드포인트별 연속 실패를 세어 차단(open) 중에는 즉시 실패시키고, 냉각 후 1건만 복구 확인(half-open)"""
+
+    def __init__(self, failure_threshold=KRX_BREAKER_FAILURE_THRESHOLD, cooldown_sec=KRX_BREAKER_COOLDOWN_SEC):
+        self._lock = threading.Lock()
+        self._failure_threshold = failure_threshold
+        self._cooldown_sec = cooldown_sec
+        self._states = {}
+
+    def _get_state(self, endpoint):
+        return self._states.setdefault(endpoint, {
+            "consecutive_failures": 0,
+            "opened_at": None,
+            "probe_in_flight": False,
+            "rejected": 0,
+            "trips": 0,
+        })
+
+    def before_call(self, endpoint):
+        """
+        차단 중이면 KrxCircuitOpenError, 냉각이 끝났으면 복구 확인 1건만 통과시킵니다.
+        반환값은 이 호출이 복구 확인 슬롯을 잡았는지 여부이며 record/release에 그대로 넘겨야 합니다.
+        """
+        now = pytime.monotonic()
+        with self._lock:
+            state = self._get_state(endpoint)
+            if state["opened_at"] is None:
+                return False
+            if not state["probe_in_flight"] and now - state["opened_at"] >= self._cooldown_sec:
+                state["probe_in_flight"] = True
+                return True
+            state["rejected"] += 1
+            remaining = max(0, round(self._cooldown_sec - (now - state["opened_at"])))
+        raise KrxCircuitOpenError(
+            f"circuit-open: 연속 {state['consecutive_failures']}회 실패로 KRX 호출 일시 중단 (복구 확인까지 약 {remaining}초)"
+        )
+
+    def record(self, endpoint, ok, is_probe=False):
+        with self._lock:
+            state = self._get_state(endpoint)
+            if is_probe:
+                state["probe_in_flight"] = False
+            elif state["opened_at"] is not None:
+                # 차단 전에 시작해 차단/복구 확인 중에 끝난 호출은 상태 판단에 쓰지 않음
+                return
+            if ok:
+                state["consecutive_failures"] = 0
+                state["opened_at"] = None
+                return
+            state["consecutive_failures"] += 1
+            if is_probe or state["consecutive_failures"] >= self._failure_threshold:
+                if state["opened_at"] is None:
+                    state["trips"] += 1
+                state["opened_at"] = pytime.monotonic()
+
+    def release(self, endpoint, is_probe=False):
+        """실패로 세지 않고 복구 확인 슬롯만 반납 (슬롯을 잡은 호출일 때만)"""
+        if not is_probe:
+            return
+        with self._lock:
+            self._get_state(endpoint)["probe_in_flight"] = False
+
+    def get_stats(self):
+        now = pytime.monotonic()
+        with self._lock:
+            stats = []
+            for endpoint, state in self._states.items():
+                if state["opened_at"] is None:
+                    status = "closed"
+                elif state["probe_in_flight"] or now - state["opened_at"] >= self._cooldown_sec:
+                    status = "half-open"
+                else:
+                    status = "open"
+                stats.append({
+                    "endpoint": urlparse(endpoint).path.rsplit("/", 1)[-1],
+                    "state": status,
+                    "consecutive_failures": state["consecutive_failures"],
+                    "trips": state["trips"],
+                    "rejected": state["rejected"],
+                })
+            return stats
+
+@st.cache_resource(show_spinner=False)
+def get_krx_circuit_breaker():
+    """프로세스 전역 KRX 엔드포인트 회로 차단기"""
+    return KrxCircuitBreaker()
+
+class KrxClients(NamedTuple):
+    """KRX 조회 경로가 쓰는 프로세스 전역 객체 묶음 (스크립트 컨텍스트가 없는 백그라운드 스레드에 전달)"""
+    payload_cache: KrxPayloadCache
+    single_flight: SingleFlight
+    breaker: KrxCircuitBreaker
+    selector: KrxProfileSelector
+    session_pool: KrxSessionPool
+    limiter: KrxRateLimiter
+    curl_like_transport: CurlLikeTransport
+
+def get_krx_clients():
+    """스크립트 스레드에서 KRX 조회용 전역 객체를 한 번에 조회"""
+    return KrxClients(
+        payload_cache=get_krx_payload_cache(),
+        single_flight=get_upstream_single_flight(),
+        breaker=get_krx_circuit_breaker(),
+        selector=get_krx_profile_selector(),
+        session_pool=get_krx_session_pool(),
+        limiter=get_krx_rate_limiter(),
+        curl_like_transport=get_curl_like_transport(),
     )
 
-def fetch_krx_derivative_index_by_date(bas_dd, auth_key):
-    """지정 기준일자 KRX 파생상품지수 데이터 조회"""
-    return fetch_krx_rows_by_date(
-        "https://data-dbg.krx.co.kr/svc/apis/idx/drvprod_dd_trd",
+def fetch_krx_rows_by_date(url, bas_dd, auth_key, priority=KRX_PRIORITY_INTERACTIVE, row_filter=None, clients=None):
+    """
+    지정 기준일자 KRX API 행 데이터 조회 (확정 일자는 디스크 캐시, 동일 요청의 동시 호출은 1회로 합침)
+    row_filter(KRX_ROW_FILTERS 키)를 주면 응답을 스트리밍으로 읽으며 조건을 통과한 행만 반환/캐시합니다.
+    백그라운드 스레드에서는 스크립트 스레드에서 만든 clients(KrxClients)를 넘겨야 합니다.
+    """
+    clients = clients or get_krx_clients()
+    cached_rows = clients.payload_cache.get(url, bas_dd, row_filter)
+    if cached_rows is not None:
+        return cached_rows
+
+    rows = clients.single_flight.do(
+        ("krx", url, bas_dd, auth_key, row_filter),
+        _fetch_krx_rows_with_breaker,
+        url,
         bas_dd,
         auth_key,
+        priority,
+        row_filter,
+        clients,
     )
+    if is_krx_basdd_final(bas_dd, rows):
+        clients.payload_cache.put(url, bas_dd, rows, row_filter)
+    return rows
 
-def normalize_kr_text(value):
-    return re.sub(r"\s+", "", str(value or "")).strip()
+def _fetch_krx_rows_with_breaker(url, bas_dd, auth_key, priority, row_filter, clients):
+    breaker = clients.breaker
+    is_probe = breaker.before_call(url)
+    try:
+        rows = _fetch_krx_rows_by_date(url, bas_dd, auth_key, priority, row_filter, clients)
+    except KrxRateLimitError:
+        # 자체 호출 제한은 엔드포인트 장애가 아니므로 실패로 세지 않음
+        breaker.release(url, is_probe)
+        raise
+    except Exception:
+        breaker.record(url, False, is_probe)
+        raise
+    breaker.record(url, True, is_probe)
+    return rows
 
-def parse_yyyymm_contract(value):
-    text = normalize_kr_text(value)
+def _fetch_krx_rows_by_date(url, bas_dd, auth_key, priority, row_filter, clients):
+    params = {"AUTH_KEY": auth_key, "basDd": bas_dd}
+    selector = clients.selector
+    session_pool = clients.session_pool
+    limiter = clients.limiter
+    host = urlparse(url).netloc
+
+    # 모든 프로필이 강등되어 재탐색 대기 중이면 바로 fallback으로 넘어감
+    last_err = RuntimeError("모든 KRX 헤더 프로필이 강등되어 재탐색 대기 중입니다.")
+    last_profile = "-"
+    last_body_preview = ""
+    for profile_name, timeout_sec in selector.ordered_attempts(host):
+        started = pytime.monotonic()
+        response = None
+        try:
+            session = session_pool.acquire(
+                profile_name,
+                timeout_sec,
+                before_warmup=lambda: limiter.acquire(url, "warmup", priority),
+            )
+            limiter.acquire(url, "profile", priority)
+            response = session.get(
+                url,
+                params=params,
+                timeout=timeout_sec,
+                allow_redirects=False,
+                stream=True,
+            )
+            if response.is_redirect or response.is_permanent_redirect:
+                redirect_url = response.headers.get("Location", "")
+                if redirect_url:
+                    target = urljoin(url, redirect_url)
+                    parsed = urlparse(target)
+                    if parsed.scheme == "http":
+                        target = target.replace("http://", "https://", 1)
+                    response.close()
+                    limiter.acquire(url, "profile", priority)
+                    response = session.get(target, timeout=timeout_sec, allow_redirects=False, stream=True)
+            response.raise_for_status()
+            rows = read_krx_rows_from_response(response, row_filter)
+        except KrxRateLimitError:
+            if response is not None:
+                response.close()
+            raise
+        except Exception as e:
+            # 스트리밍 응답은 닫아야 커넥션이 풀(pool_block=True)로 반납됨, 오류 본문은 닫기 전에 앞부분만 보관
+            if isinstance(e, requests.HTTPError) and e.response is not None:
+                last_body_preview = read_krx_body_preview(e.response)
+            if response is not None:
+                response.close()
+            selector.record(host, profile_name, timeout_sec, False, pytime.monotonic() - started)
+            if is_krx_rejection(e):
+                session_pool.invalidate(profile_name)
+            last_profile = profile_name
+            last_err = e
+            continue
+        selector.record(host, profile_name, timeout_sec, True, pytime.monotonic() - started)
+        return rows
+
+    if isinstance(last_err, requests.HTTPError) and last_err.response is not None:
+        request_err = RuntimeError(
+            f"HTTP {last_err.response.status_code}: {last_body_preview} "
+            f"(profile={last_profile}, 브라우저는 성공/앱은 실패 시 서버측 IP 차단 또는 봇 차단 가능)"
+        )
+    else:
+        request_err = last_err
+
+    # requests가 WAF에 차단될 때 curl 형태의 요청이 통과하는 경우가 있어 fallback 시도
+    transport_name = get_krx_fallback_transport_name()
+    fallback_label = f"fallback:{transport_name}"
+    limiter.acquire(url, "fallback", priority)
+    started = pytime.monotonic()
+    try:
+        out = KRX_FALLBACK_TRANSPORTS[transport_name](f"{url}?AUTH_KEY={auth_key}&basDd={bas_dd}", clients)
+        rows = parse_krx_rows((out,), row_filter)
+    except Exception as fallback_err:
+        selector.record(host, fallback_label, KRX_FALLBACK_TIMEOUT_SEC, False, pytime.monotonic() - started)
+        raise RuntimeError(
+            f"{request_err} | {transport_name}_fallback_error={str(fallback_err)[:200]}"
+        ) from fallback_err
+    # 필터를 통과한 행이 없어도(야간 미게시/휴장일) 응답에 행이 있으면 정상 응답으로 간주
+    selector.record(host, fallback_label, KRX_FALLBACK_TIMEOUT_SEC, bool(rows.scanned), pytime.monotonic() - started)
+    if rows.scanned:
+        return rows
+
+    raise request_err
+
+# 같은 PROD_NM/ISU_NM/BAS_DD 원문이 행마다 반복되므로 패턴은 미리 컴파일하고 결과는 원문 문자열 기준으로 메모
+KR_TEXT_PARSE_CACHE_SIZE = 4096
+WHITESPACE_PATTERN = re.compile(r"\s+")
+NON_DIGIT_PATTERN = re.compile(r"\D")
+# 1) YYYYMM or YYYY-MM/ YYYY.MM
+CONTRACT_YYYYMM_PATTERN = re.compile(r"(20\d{2})[-./]?(0[1-9]|1[0-2])")
+# 2) YYMM (ex: 2603)
+CONTRACT_YYMM_PATTERN = re.compile(r"(?<!\d)(\d{2})(0[1-9]|1[0-2])(?!\d)")
+# 3) YYYY년M월 / YY년M월
+CONTRACT_KR_MONTH_PATTERN = re.compile(r"((?:20)?\d{2})년\s*([1-9]|1[0-2])월")
+
+@lru_cache(maxsize=KR_TEXT_PARSE_CACHE_SIZE)
+def _normalize_kr_text_cached(text):
+    return WHITESPACE_PATTERN.sub("", text).strip()
 
-    # 1) YYYYMM or YYYY-MM/ YYYY.MM
-    match = re.search(r"(20\d{2})[-./]?(0[1-9]|1[0-2])", text)
+def normalize_kr_text(value):
+    return _normalize_kr_text_cached(str(value or ""))
+
+@lru_cache(maxsize=KR_TEXT_PARSE_CACHE_SIZE)
+def _parse_yyyymm_contract_cached(text):
+    match = CONTRACT_YYYYMM_PATTERN.search(text)
     if match:
         return int(f"{match.group(1)}{match.group(2)}")
 
-    # 2) YYMM (ex: 2603)
-    match = re.search(r"(?<!\d)(\d{2})(0[1-9]|1[0-2])(?!\d)", text)
+    match = CONTRACT_YYMM_PATTERN.search(text)
     if match:
         return int(f"20{match.group(1)}{match.group(2)}")
 
-    # 3) YYYY년M월 / YY년M월
-    match = re.search(r"((?:20)?\d{2})년\s*([1-9]|1[0-2])월", text)
+    match = CONTRACT_KR_MONTH_PATTERN.search(text)
     if match:
         year = match.group(1)
         if len(year) == 2:
@@ -638,6 +2101,15 @@ def parse_yyyymm_contract(value):
 
     return None
 
+def parse_yyyymm_contract(value):
+    return _parse_yyyymm_contract_cached(normalize_kr_text(value))
+
+@lru_cache(maxsize=KR_TEXT_PARSE_CACHE_SIZE)
+def _bas_dd_digits_cached(text):
+    """basDd 원문의 앞 8자리 숫자 (8자리 미만이면 None)"""
+    digits = NON_DIGIT_PATTERN.sub("", text)
+    return digits[:8] if len(digits) >= 8 else None
+
 def yyyymm_to_serial(yyyymm):
     year = int(yyyymm) // 100
     month = int(yyyymm) % 100
@@ -649,14 +2121,12 @@ def get_current_yyyymm_kst():
     return now_kst.year * 100 + now_kst.month
 
 def normalize_bas_dd(value):
-    digits = re.sub(r"\D", "", str(value or ""))
-    if len(digits) >= 8:
-        return int(digits[:8])
-    return 0
+    digits = _bas_dd_digits_cached(str(value or ""))
+    return int(digits) if digits else 0
 
 def format_bas_dd(value):
-    digits = re.sub(r"\D", "", str(value or ""))
-    if len(digits) >= 8:
+    digits = _bas_dd_digits_cached(str(value or ""))
+    if digits:
         return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
     return str(value) if value is not None else "-"
 
@@ -690,163 +2160,451 @@ def normalize_change_rate_text(value):
     except Exception:
         return None
 
-def build_kospi_night_candidates(rows):
-    """코스피200 선물/야간 후보에서 파싱 가능한 월물 목록 생성"""
-    candidates = []
-    for row in rows:
-        prod_nm = normalize_kr_text(row.get("PROD_NM"))
-        mkt_nm = normalize_kr_text(row.get("MKT_NM"))
+def is_kospi200_night_futures_row(row):
+    """코스피200 선물 야간 시장 행 여부 (API별 표기 차이(공백/접미어)를 허용)"""
+    return (
+        "코스피200선물" in normalize_kr_text(row.get("PROD_NM"))
+        and "야간" in normalize_kr_text(row.get("MKT_NM"))
+    )
 
-        # API별 표기 차이(공백/접미어)를 허용
-        if "코스피200선물" not in prod_nm:
-            continue
-        if "야간" not in mkt_nm:
-            continue
+class KrxRowFilter(NamedTuple):
+    """스트리밍 추출 단계로 내려보내는 행 조건 (required_text: 디코딩 전 행 원문에 반드시 있는 문자열)"""
+    predicate: object
+    required_text: tuple = ()
 
-        # 요구 조건: ISU_NM == "코스피200 F {YYYYMM} (야간)" 형식만 허용
-        isu_nm = str(row.get("ISU_NM") or "").strip()
-        match = re.match(r"^코스피200\s*F\s*(20\d{2})(0[1-9]|1[0-2])\s*\(야간\)$", isu_nm)
-        if not match:
-            continue
-        yyyymm = int(f"{match.group(1)}{match.group(2)}")
-        candidates.append((yyyymm, row))
-    return candidates
+# fetch_krx_rows_by_date(row_filter=...)에 이름으로 전달 (이름은 캐시 키에 포함, KRX_PRODUCTS 묶음별로 등록)
+KRX_ROW_FILTERS = {}
 
-def select_latest_kospi_night_contract(rows):
-    """코스피200 선물/야간 중 현재 기준 최근(근접) 월물 계약 선택"""
-    candidates = build_kospi_night_candidates(rows)
+KRX_SESSION_DAY = "정규"
+KRX_SESSION_NIGHT = "야간"
+KOSPI200_FUTURES_PRODUCT = "코스피200선물"
+# 단일 월물 선물 종목명 "{기초자산} F {YYYYMM}" (야간은 " (야간)" 접미어), 스프레드(SP) 등은 색인하지 않음
+KRX_FUTURES_ISU_PATTERN = re.compile(r"^.+?\s*F\s*(20\d{2}(?:0[1-9]|1[0-2]))\s*(?:\(야간\))?$")
 
-    if not candidates:
-        return None
+def build_krx_futures_frame(rows):
+    """
+    KRX 선물 행을 열 단위 표로 한 번 적재해 단일 월물 종목만 남깁니다.
+    상품명 공백 정규화, 세션 구분, 월물 추출, 기준일 정규화를 모두 벡터화된 문자열 연산으로 수행합니다.
+    """
+    frame = pd.DataFrame.from_records(rows, columns=["PROD_NM", "MKT_NM", "ISU_NM", "BAS_DD"])
+
+    def text_column(name):
+        return frame[name].fillna("").astype(str)
+
+    isu_nm = text_column("ISU_NM")
+    month_text = isu_nm.str.strip().str.extract(KRX_FUTURES_ISU_PATTERN, expand=False)
+    bas_dd_digits = text_column("BAS_DD").str.replace(NON_DIGIT_PATTERN, "", regex=True)
+    bas_dd = pd.to_numeric(bas_dd_digits.str[:8].where(bas_dd_digits.str.len() >= 8), errors="coerce")
+    is_night = text_column("MKT_NM").str.contains(KRX_SESSION_NIGHT, regex=False).to_numpy(dtype=bool)
+
+    futures = pd.DataFrame({
+        "row_pos": np.arange(len(frame)),
+        "product": text_column("PROD_NM").str.replace(WHITESPACE_PATTERN, "", regex=True),
+        "session": np.where(is_night, KRX_SESSION_NIGHT, KRX_SESSION_DAY),
+        "month": month_text,
+        "bas_dd": bas_dd.fillna(0),
+        "isu_nm": isu_nm,
+    })[month_text.notna().to_numpy(dtype=bool)]
+    return futures.astype({"month": "int64", "bas_dd": "int64"})
+
+def pick_nearest_contract_month(months, current_yyyymm):
+    """현재 월과 가장 가까운 월물 (거리가 같으면 다가올 월물 우선)"""
+    months = np.asarray(months, dtype="int64")
+    serials = months // 100 * 12 + months % 100
+    diffs = serials - yyyymm_to_serial(current_yyyymm)
+    return int(months[np.lexsort((serials, diffs < 0, np.abs(diffs)))[0]])
+
+class KrxProductCatalog:
+    """
+    기준일 선물 페이로드 1건을 (정규화 상품명, 세션, 월물) 키로 색인한 카탈로그.
+    같은 키에 행이 여럿이면 기준일/종목명이 가장 큰 행을 대표로 두며, 새 카드는 전체 스캔 없이 사전 조회로 답합니다.
+    """
 
-    current_yyyymm = get_current_yyyymm_kst()
-    current_serial = yyyymm_to_serial(current_yyyymm)
-
-    unique_months = sorted({month for month, _ in candidates})
-    target_month = min(
-        unique_months,
-        key=lambda month: (
-            abs(yyyymm_to_serial(month) - current_serial),
-            0 if yyyymm_to_serial(month) >= current_serial else 1,
-            yyyymm_to_serial(month),
-        ),
-    )
+    def __init__(self, rows):
+        self.rows = rows
+        futures = build_krx_futures_frame(rows).sort_values(
+            ["product", "session", "month", "bas_dd", "isu_nm"],
+            ascending=[True, True, True, False, False],
+            kind="stable",
+        )
+        self._row_counts = {
+            key: int(count) for key, count in futures.groupby(["product", "session"]).size().items()
+        }
+        best = futures.drop_duplicates(["product", "session", "month"], keep="first")
+        self._index = {
+            (product, session, int(month)): rows[int(row_pos)]
+            for product, session, month, row_pos in zip(best["product"], best["session"], best["month"], best["row_pos"])
+        }
+        months = {}
+        for product, session, month in self._index:
+            months.setdefault((product, session), []).append(month)
+        self._months = {key: tuple(sorted(values)) for key, values in months.items()}
+        self._products = sorted({product for product, _ in self._months})
+
+    def products(self):
+        return list(self._products)
+
+    def resolve_product(self, product):
+        """정규화 상품명이 정확히 없으면 이를 포함하는 가장 짧은 상품명(표기 접미어 허용)"""
+        normalized = normalize_kr_text(product)
+        if normalized in self._products:
+            return normalized
+        matches = [name for name in self._products if normalized in name]
+        return min(matches, key=len) if matches else None
+
+    def months(self, product, session):
+        return self._months.get((product, session), ())
+
+    def row_count(self, product, session):
+        return self._row_counts.get((product, session), 0)
+
+    def get(self, product, session, month):
+        return self._index.get((product, session, month))
+
+    def nearest_month(self, product, session, current_yyyymm, offset=0):
+        """현재 기준 최근(근접) 월물, offset=1이면 그다음 상장 월물"""
+        months = self.months(product, session)
+        if not months:
+            return None
+        position = months.index(pick_nearest_contract_month(months, current_yyyymm)) + offset
+        return months[position] if 0 <= position < len(months) else None
+
+def is_kospi200_volatility_row(row):
+    """코스피200 변동성 지수 행 여부"""
+    return normalize_kr_text(row.get("IDX_NM")) == "코스피200변동성지수"
+
+def latest_index_sort_key(row, current_yyyymm):
+    """지수 행 선택 기준: 최신 기준일 → 지수 분류 → 지수명"""
+    return normalize_bas_dd(row.get("BAS_DD")), str(row.get("IDX_CLSS", "")), str(row.get("IDX_NM", ""))
 
-    same_month_rows = [row for month, row in candidates if month == target_month]
-    same_month_rows.sort(
-        key=lambda row: (
-            normalize_bas_dd(row.get("BAS_DD")),
-            str(row.get("ISU_NM", "")),
+class KrxProductSpec(NamedTuple):
+    """
+    KRX 카드 1개 선언: 엔드포인트, 행 조건(스트리밍 추출로 전달), 정렬 키(조건 통과 행 중 최댓값 선택), 표시 필드.
+    contract=(상품명, 세션, 월물 offset)이면 정렬 키 대신 선물 카탈로그의 근월물 조회로 선택합니다.
+    """
+    key: str
+    label: str
+    url: str
+    predicate: object
+    value_field: str
+    change_field: str
+    name_field: str
+    extra_fields: tuple
+    rate_field: Optional[str] = None
+    sort_key: object = None
+    contract: Optional[tuple] = None
+    required_text: tuple = ()
+    include_night_session: bool = False
+
+# 화면 카드 순서대로 선언, 같은 엔드포인트 상품은 기준일당 1회 조회로 묶음
+KRX_PRODUCTS = {
+    spec.key: spec
+    for spec in (
+        KrxProductSpec(
+            key="kospi200_night_futures",
+            label="KOSPI 200 야간선물",
+            url=KRX_FUTURES_URL,
+            predicate=is_kospi200_night_futures_row,
+            value_field="TDD_CLSPRC",
+            change_field="CMPPREVDD_PRC",
+            name_field="ISU_NM",
+            extra_fields=("BAS_DD", "PROD_NM", "MKT_NM"),
+            contract=(KOSPI200_FUTURES_PRODUCT, KRX_SESSION_NIGHT, 0),
+            required_text=("야간",),
+            include_night_session=True,
+        ),
+        KrxProductSpec(
+            key="kospi200_volatility_index",
+            label="KOSPI 200 변동성 지수",
+            url=KRX_DERIVATIVE_INDEX_URL,
+            predicate=is_kospi200_volatility_row,
+            value_field="CLSPRC_IDX",
+            change_field="CMPPREVDD_IDX",
+            name_field="IDX_NM",
+            extra_fields=("BAS_DD", "IDX_CLSS", "IDX_NM"),
+            rate_field="FLUC_RT",
+            sort_key=latest_index_sort_key,
+            required_text=("변동성",),
         ),
-        reverse=True
     )
-    return same_month_rows[0] if same_month_rows else None
+}
+
+def build_krx_product_groups(products):
+    """엔드포인트별 (상품 선언 목록, 합친 행 조건 이름) 구성 후 KRX_ROW_FILTERS에 등록"""
+    specs_by_url = {}
+    for spec in products.values():
+        specs_by_url.setdefault(spec.url, []).append(spec)
+
+    groups = {}
+    for url, specs in specs_by_url.items():
+        row_filter = "+".join(spec.key for spec in specs)
+        predicates = tuple(spec.predicate for spec in specs)
+        # 원문 선별 문자열은 모든 상품에 공통일 때만 쓸 수 있음
+        required_text = tuple(
+            text for text in specs[0].required_text
+            if all(text in spec.required_text for spec in specs[1:])
+        )
+        KRX_ROW_FILTERS[row_filter] = KrxRowFilter(
+            lambda row, predicates=predicates: any(predicate(row) for predicate in predicates),
+            required_text,
+        )
+        groups[url] = (tuple(specs), row_filter)
+    return groups
+
+KRX_PRODUCT_GROUPS = build_krx_product_groups(KRX_PRODUCTS)
+
+def select_krx_product_row(spec, rows, get_catalog, current_yyyymm):
+    """상품 선언대로 기준일 행 목록에서 1건 선택, (선택 행, 디버그 통계) 반환"""
+    if spec.contract is not None:
+        product_name, session, month_offset = spec.contract
+        catalog = get_catalog()
+        product = catalog.resolve_product(product_name)
+        target_month = catalog.nearest_month(product, session, current_yyyymm, month_offset)
+        months = catalog.months(product, session)
+        return catalog.get(product, session, target_month), {
+            "filtered": catalog.row_count(product, session),
+            "candidate_months": ",".join(str(month) for month in months) or "-",
+            "target_month": str(target_month or "-"),
+        }
 
-@st.cache_data(show_spinner=False, ttl=60)
-def _get_latest_kospi_night_futures_cached(auth_key, bas_dd_candidates, debug_version):
-    """KRX AUTH_KEY와 기준일 후보에 종속된 캐시 조회"""
-    debug_logs = []
-    last_error = None
-    current_yyyymm = get_current_yyyymm_kst()
-    for bas_dd in bas_dd_candidates:
-        try:
-            rows = fetch_krx_futures_by_date(bas_dd, auth_key)
-        except Exception as e:
-            last_error = str(e)
-            debug_logs.append({
-                "request_bas_dd": bas_dd,
-                "bas_dd": bas_dd,
-                "status": "error",
-                "rows": 0,
-                "filtered": 0,
-                "selected_isu_nm": "-",
-                "selected_bas_dd": "-",
-                "selected_close": "-",
-                "message": str(e),
-                "current_yyyymm": current_yyyymm,
-                "candidate_months": "-",
-                "target_month": "-",
-            })
-            continue
+    matches = [row for row in rows if spec.predicate(row)]
+    selected = max(matches, key=lambda row: spec.sort_key(row, current_yyyymm), default=None)
+    return selected, {"filtered": len(matches)}
 
-        candidates = build_kospi_night_candidates(rows)
-        filtered_count = len(candidates)
-        unique_months = sorted({month for month, _ in candidates})
-        target_month = "-"
-        if unique_months:
-            current_serial = yyyymm_to_serial(current_yyyymm)
-            target_month = min(
-                unique_months,
-                key=lambda month: (
-                    abs(yyyymm_to_serial(month) - current_serial),
-                    0 if yyyymm_to_serial(month) >= current_serial else 1,
-                    yyyymm_to_serial(month),
-                ),
-            )
-        selected = select_latest_kospi_night_contract(rows)
-        debug_logs.append({
-            "request_bas_dd": bas_dd,
-            "bas_dd": bas_dd,
-            "status": "ok",
-            "rows": len(rows),
-            "filtered": filtered_count,
-            "selected_isu_nm": str(selected.get("ISU_NM")) if selected else "-",
-            "selected_bas_dd": str(selected.get("BAS_DD")) if selected else "-",
-            "selected_close": str(selected.get("TDD_CLSPRC")) if selected else "-",
-            "message": "selected" if selected else "no-match",
-            "current_yyyymm": current_yyyymm,
-            "candidate_months": ",".join(str(m) for m in unique_months) if unique_months else "-",
-            "target_month": str(target_month),
-        })
-        if selected is not None:
-            return selected, None, debug_logs
+def probe_krx_candidates(bas_dd_candidates, probe_fn, keys):
+    """
+    기준일 후보를 제한된 워커로 병렬 조회하고 키(상품)별로 가장 최신 일치 행을 모읍니다.
+    probe_fn(bas_dd)는 ({키: 선택 행}, {키: 디버그 로그})를 반환해야 하며,
+    모든 키가 채워지면 아직 시작하지 않은 과거 후보 요청은 취소합니다.
+    """
+    selected = {}
+    debug_logs = {key: [] for key in keys}
+    executor = make_script_thread_pool(KRX_PROBE_MAX_WORKERS, "krx-probe")
+    try:
+        probes = [(bas_dd, executor.submit(probe_fn, bas_dd)) for bas_dd in bas_dd_candidates]
+        for position, (bas_dd, future) in enumerate(probes):
+            found, logs = future.result()
+            for key, debug_log in logs.items():
+                debug_logs[key].append(debug_log)
+            for key, row in found.items():
+                selected.setdefault(key, row)
+            if len(selected) < len(debug_logs):
+                continue
 
-    if last_error:
-        return None, f"KRX API 호출 실패: {last_error}", debug_logs
-    return None, "최근 10일(내일 기준) 내 야간 코스피200 선물 데이터가 없습니다.", debug_logs
+            for skipped_bas_dd, skipped_future in probes[position + 1:]:
+                if skipped_future.cancel():
+                    status, message = "cancelled", "newer-basdd-selected"
+                elif skipped_future.done():
+                    status, message = "superseded", "completed-but-newer-basdd-selected"
+                else:
+                    status, message = "superseded", "in-flight-result-discarded"
+                for key_logs in debug_logs.values():
+                    key_logs.append({
+                        "request_bas_dd": skipped_bas_dd,
+                        "status": status,
+                        "rows": 0,
+                        "filtered": 0,
+                        "selected_bas_dd": "-",
+                        "selected_close": "-",
+                        "message": message,
+                    })
+            break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return selected, debug_logs
+
+def get_last_krx_probe_error(debug_logs):
+    return next((log["message"] for log in reversed(debug_logs) if log["status"] == "error"), None)
+
+def format_age_text(age_sec):
+    """경과 시간(초)을 '3분', '2시간 5분' 형태로 표시"""
+    minutes = int(age_sec // 60)
+    if minutes < 1:
+        return f"{int(age_sec)}초"
+    if minutes < 60:
+        return f"{minutes}분"
+    return f"{minutes // 60}시간 {minutes % 60}분"
+
+def get_krx_publication_datetime(bas_date, kr_holiday_set=None):
+    """기준일 bas_date 데이터가 KRX OpenAPI에 게시되는 예정 시각 (다음 거래일 KRX_PUBLICATION_TIME)"""
+    next_trading_date = get_next_krx_trading_date(bas_date, kr_holiday_set)
+    return KST_TZ.localize(datetime.combine(next_trading_date, KRX_PUBLICATION_TIME))
+
+def get_krx_latest_ttl_sec(result, now_kst=None, kr_holiday_set=None):
+    """
+    게시 일정과 거래일 달력 기준 최신 KRX 카드 값의 유효 시간(초).
+    이미 게시된 최신 기준일을 보유하면 다음 게시 예정 시각까지 길게 유지하고,
+    새 기준일이 게시될 시간대인데 아직 받지 못했으면 짧게 재조회합니다.
+    """
+    row, msg, debug_logs = result
+    if row is None and get_last_krx_probe_error(debug_logs):
+        return KRX_LATEST_ERROR_TTL_SEC
 
-def get_latest_kospi_night_futures():
-    """최신 유효 코스피200 야간선물 데이터 1건 조회"""
-    auth_key, auth_msg = get_krx_auth_key()
-    if not auth_key:
-        return None, auth_msg, []
-    bas_dd_candidates = tuple(iter_basdd_candidates_kst())
-    return _get_latest_kospi_night_futures_cached(auth_key, bas_dd_candidates, "debug-v2")
-
-def select_kospi200_volatility_index(rows):
-    """코스피200 변동성 지수 1건 선택"""
-    normalized_target = normalize_kr_text("코스피200변동성지수")
-    matches = []
-    for row in rows:
-        idx_nm = normalize_kr_text(row.get("IDX_NM"))
-        if idx_nm != normalized_target:
-            continue
-        matches.append(row)
+    now_kst = now_kst or datetime.now(KST_TZ)
+    if kr_holiday_set is None:
+        years = (now_kst.year - 1, now_kst.year, now_kst.year + 1)
+        kr_holiday_set = set(get_kr_holiday_dates(years))
 
-    if not matches:
-        return None
+    # 게시 예정 시각이 지난 가장 최근 기준일
+    expected_date = None
+    for trading_date in iter_previous_krx_trading_dates(now_kst.date(), 5, kr_holiday_set):
+        if get_krx_publication_datetime(trading_date, kr_holiday_set) <= now_kst:
+            expected_date = trading_date
+            break
+    if expected_date is None:
+        return KRX_PUBLICATION_POLL_SEC
+
+    have_bas_dd = normalize_bas_dd(row.get("BAS_DD")) if row is not None else 0
+    if have_bas_dd >= int(expected_date.strftime("%Y%m%d")):
+        next_publication = get_krx_publication_datetime(
+            get_next_krx_trading_date(expected_date, kr_holiday_set),
+            kr_holiday_set,
+        )
+        ttl_sec = (next_publication - now_kst).total_seconds()
+        return int(min(max(ttl_sec, KRX_PUBLICATION_POLL_SEC), KRX_LATEST_MAX_TTL_SEC))
 
-    matches.sort(
-        key=lambda row: (
-            normalize_bas_dd(row.get("BAS_DD")),
-            str(row.get("IDX_CLSS", "")),
-            str(row.get("IDX_NM", "")),
-        ),
-        reverse=True,
-    )
-    return matches[0]
-
-@st.cache_data(show_spinner=False, ttl=60)
-def _get_latest_kospi200_volatility_index_cached(auth_key, bas_dd_candidates, debug_version):
-    """KRX AUTH_KEY와 기준일 후보에 종속된 변동성 지수 캐시 조회"""
-    debug_logs = []
-    last_error = None
-    for bas_dd in bas_dd_candidates:
+    published_for_sec = (now_kst - get_krx_publication_datetime(expected_date, kr_holiday_set)).total_seconds()
+    if published_for_sec < KRX_PUBLICATION_LATE_AFTER_SEC:
+        return KRX_PUBLICATION_POLL_SEC
+    return KRX_PUBLICATION_LATE_POLL_SEC
+
+class KrxLatestValueCache:
+    """
+    엔드포인트 묶음별 최신 KRX 카드 값({상품 키: (선택 행, 메시지, 디버그 로그)})을 stale-while-revalidate 방식으로 제공합니다.
+    만료된 값은 즉시 반환하고 백그라운드 갱신은 묶음당 1건만 낮은 우선순위(loader(priority))로 돌리며,
+    조회가 실패한 상품은 마지막 정상 행을 경과 시간과 함께 stale로 표시해 반환합니다.
+    갱신 스레드는 스크립트 컨텍스트가 없으므로 loader와 kr_holiday_set은 st 캐시를 거치지 않아야 합니다.
+    """
+
+    def __init__(self, ttl_policy=get_krx_latest_ttl_sec):
+        self._lock = threading.Lock()
+        self._ttl_policy = ttl_policy
+        self._entries = {}
+        self._refreshing = set()
+
+    def get(self, key, product_keys, candidates, loader, kr_holiday_set=None):
+        now = pytime.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            start_refresh = False
+            if entry is not None:
+                expired = entry["candidates"] != candidates or now >= entry["expires_at"]
+                if expired and key not in self._refreshing:
+                    self._refreshing.add(key)
+                    start_refresh = True
+                served = self._serve(entry, now)
+
+        if entry is None:
+            entry = get_upstream_single_flight().do(
+                ("krx-latest", key),
+                self._load,
+                key,
+                product_keys,
+                candidates,
+                loader,
+                KRX_PRIORITY_INTERACTIVE,
+                kr_holiday_set,
+            )
+            with self._lock:
+                return self._serve(entry, pytime.monotonic())
+
+        if start_refresh:
+            threading.Thread(
+                target=self._refresh,
+                args=(key, product_keys, candidates, loader, kr_holiday_set),
+                name=f"krx-refresh-{'+'.join(product_keys)}",
+                daemon=True,
+            ).start()
+        return served
+
+    def _refresh(self, key, product_keys, candidates, loader, kr_holiday_set):
+        try:
+            self._load(key, product_keys, candidates, loader, KRX_PRIORITY_BACKGROUND, kr_holiday_set)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _load(self, key, product_keys, candidates, loader, priority, kr_holiday_set=None):
         try:
-            rows = fetch_krx_derivative_index_by_date(bas_dd, auth_key)
+            results = loader(priority)
         except Exception as e:
-            last_error = str(e)
-            debug_logs.append({
+            # 조회 자체가 실패한 경우도 오류 로그로 남겨 TTL 정책이 짧은 재시도 주기를 쓰게 함
+            error_log = {"request_bas_dd": "-", "status": "error", "rows": 0, "message": str(e)}
+            results = {
+                product_key: (None, f"KRX 조회 중 오류 발생: {e}", [dict(error_log)])
+                for product_key in product_keys
+            }
+        ttl_sec = min(self._ttl_policy(result, kr_holiday_set=kr_holiday_set) for result in results.values())
+        now = pytime.monotonic()
+        with self._lock:
+            previous = self._entries.get(key)
+            last_good = dict(previous["last_good"]) if previous else {}
+            for product_key, result in results.items():
+                if result[0] is not None:
+                    last_good[product_key] = (result, now)
+            entry = {
+                "results": results,
+                "candidates": candidates,
+                "fetched_at": now,
+                "expires_at": now + ttl_sec,
+                "ttl_sec": ttl_sec,
+                "last_good": last_good,
+            }
+            self._entries[key] = entry
+            return entry
+
+    def _serve(self, entry, now):
+        served = {}
+        for product_key, result in entry["results"].items():
+            row, msg, debug_logs = result
+            last_good = entry["last_good"].get(product_key)
+            if row is not None or last_good is None:
+                served[product_key] = result
+                continue
+            (good_row, _, _), good_at = last_good
+            stale_msg = f"⚠️ 최신 조회 실패, 마지막 정상값 표시 ({format_age_text(now - good_at)} 전 조회)"
+            served[product_key] = (good_row, stale_msg, debug_logs)
+        return served
+
+    def get_stats(self):
+        now = pytime.monotonic()
+        with self._lock:
+            stats = []
+            for key, entry in self._entries.items():
+                for product_key, result in entry["results"].items():
+                    last_good = entry["last_good"].get(product_key)
+                    if result[0] is None and last_good is not None:
+                        status = "stale"
+                    elif result[0] is None:
+                        status = "empty"
+                    elif now >= entry["expires_at"]:
+                        status = "expired"
+                    else:
+                        status = "fresh"
+                    stats.append({
+                        "name": product_key,
+                        "state": status,
+                        "age_sec": round(now - entry["fetched_at"]),
+                        "ttl_sec": entry["ttl_sec"],
+                        "last_good_age_sec": round(now - last_good[1]) if last_good else None,
+                        "refreshing": key in self._refreshing,
+                    })
+            return stats
+
+@st.cache_resource(show_spinner=False)
+def get_krx_latest_value_cache():
+    """프로세스 전역 최신 KRX 카드 값 캐시"""
+    return KrxLatestValueCache()
+
+def probe_krx_product_group(url, bas_dd, auth_key, current_yyyymm, priority=KRX_PRIORITY_INTERACTIVE, clients=None):
+    """기준일 1건을 엔드포인트당 1회 조회해 묶음의 모든 상품을 선택하고 상품별 디버그 로그 생성"""
+    specs, row_filter = KRX_PRODUCT_GROUPS[url]
+    clients = clients or get_krx_clients()
+    try:
+        rows = fetch_krx_rows_by_date(url, bas_dd, auth_key, priority, row_filter, clients)
+    except Exception as e:
+        return {}, {
+            spec.key: {
                 "request_bas_dd": bas_dd,
                 "status": "error",
                 "rows": 0,
@@ -855,40 +2613,78 @@ def _get_latest_kospi200_volatility_index_cached(auth_key, bas_dd_candidates, de
                 "selected_name": "-",
                 "selected_close": "-",
                 "message": str(e),
-            })
-            continue
+            }
+            for spec in specs
+        }
 
-        selected = select_kospi200_volatility_index(rows)
-        filtered_count = sum(
-            1 for row in rows
-            if normalize_kr_text(row.get("IDX_NM")) == normalize_kr_text("코스피200변동성지수")
-        )
-        debug_logs.append({
+    def get_catalog():
+        return clients.payload_cache.get_catalog(url, bas_dd, rows, row_filter)
+
+    found = {}
+    debug_logs = {}
+    for spec in specs:
+        selected, stats = select_krx_product_row(spec, rows, get_catalog, current_yyyymm)
+        if selected is not None:
+            found[spec.key] = selected
+        debug_logs[spec.key] = {
             "request_bas_dd": bas_dd,
             "status": "ok",
-            "rows": len(rows),
-            "filtered": filtered_count,
+            "rows": rows.scanned,
             "selected_bas_dd": str(selected.get("BAS_DD")) if selected else "-",
-            "selected_name": str(selected.get("IDX_NM")) if selected else "-",
-            "selected_close": str(selected.get("CLSPRC_IDX")) if selected else "-",
+            "selected_name": str(selected.get(spec.name_field)) if selected else "-",
+            "selected_close": str(selected.get(spec.value_field)) if selected else "-",
             "message": "selected" if selected else "no-match",
-        })
-        if selected is not None:
-            return selected, None, debug_logs
+            "current_yyyymm": current_yyyymm,
+            **stats,
+        }
+    return found, debug_logs
 
-    if last_error:
-        return None, f"KRX API 호출 실패: {last_error}", debug_logs
-    return None, "최근 10일(내일 기준) 내 코스피200 변동성 지수 데이터가 없습니다.", debug_logs
+def _load_latest_krx_product_group(url, auth_key, bas_dd_candidates, priority=KRX_PRIORITY_INTERACTIVE, clients=None):
+    """KRX AUTH_KEY와 기준일 후보로 엔드포인트 묶음의 상품별 최신 1건 조회"""
+    specs, _ = KRX_PRODUCT_GROUPS[url]
+    clients = clients or get_krx_clients()
+    current_yyyymm = get_current_yyyymm_kst()
+    selected, debug_logs = probe_krx_candidates(
+        bas_dd_candidates,
+        lambda bas_dd: probe_krx_product_group(url, bas_dd, auth_key, current_yyyymm, priority, clients),
+        [spec.key for spec in specs],
+    )
+
+    results = {}
+    for spec in specs:
+        logs = debug_logs[spec.key]
+        if spec.key in selected:
+            results[spec.key] = (selected[spec.key], None, logs)
+            continue
+        last_error = get_last_krx_probe_error(logs)
+        if last_error:
+            results[spec.key] = (None, f"KRX API 호출 실패: {last_error}", logs)
+        else:
+            results[spec.key] = (None, f"최근 10일(내일 기준) 내 {spec.label} 데이터가 없습니다.", logs)
+    return results
 
-def get_latest_kospi200_volatility_index():
-    """최신 유효 코스피200 변동성 지수 데이터 1건 조회"""
+def get_latest_krx_product_group(url):
+    """엔드포인트 묶음의 최신 유효 KRX 상품 데이터 조회 ({상품 키: (행, 메시지, 디버그 로그)})"""
+    specs, _ = KRX_PRODUCT_GROUPS[url]
+    product_keys = [spec.key for spec in specs]
     auth_key, auth_msg = get_krx_auth_key()
     if not auth_key:
-        return None, auth_msg, []
-    bas_dd_candidates = tuple(iter_basdd_candidates_kst())
-    return _get_latest_kospi200_volatility_index_cached(auth_key, bas_dd_candidates, "debug-v1")
+        return {product_key: (None, auth_msg, []) for product_key in product_keys}
+    include_night_session = any(spec.include_night_session for spec in specs)
+    bas_dd_candidates = tuple(iter_basdd_candidates_kst(include_night_session=include_night_session))
+    # 갱신은 스크립트 실행보다 오래 사는 백그라운드 스레드에서도 돌므로 전역 객체/휴장일은 여기서 미리 조회
+    clients = get_krx_clients()
+    now_kst = datetime.now(KST_TZ)
+    kr_holiday_set = frozenset(get_kr_holiday_dates((now_kst.year - 1, now_kst.year, now_kst.year + 1)))
+    return get_krx_latest_value_cache().get(
+        (url, auth_key),
+        product_keys,
+        bas_dd_candidates,
+        lambda priority: _load_latest_krx_product_group(url, auth_key, bas_dd_candidates, priority, clients),
+        kr_holiday_set,
+    )
 
-def render_krx_debug_logs(title, debug_logs, selected_name_col):
+def render_krx_debug_logs(title, debug_logs):
     """KRX 조회 이력을 화면에 디버그용으로 표시"""
     if not debug_logs:
         return
@@ -902,7 +2698,7 @@ def render_krx_debug_logs(title, debug_logs, selected_name_col):
         "rows",
         "filtered",
         "selected_bas_dd",
-        selected_name_col,
+        "selected_name",
         "selected_close",
         "message",
     ]
@@ -917,47 +2713,201 @@ def render_krx_debug_logs(title, debug_logs, selected_name_col):
             "candidate_months": "후보월물",
             "target_month": "선택월물",
             "selected_bas_dd": "응답기준일",
-            "selected_isu_nm": "선택종목",
-            "selected_name": "선택지수",
+            "selected_name": "선택항목",
             "selected_close": "종가",
             "message": "메시지",
         }
     )
 
     with st.expander(title, expanded=False):
-        st.caption("조회순서 1이 가장 먼저 요청된 기준일입니다. (내일→오늘→과거)")
+        st.caption("조회순서 1이 가장 최신 기준일입니다. (내일→오늘→과거, 병렬 조회 후 최신 일치 기준일 선택)")
         st.dataframe(logs_df, width="stretch", hide_index=True)
 
-def render_kospi_night_debug_logs(debug_logs):
-    """야간선물 조회 이력을 화면에 디버그용으로 표시"""
-    render_krx_debug_logs("야간선물 데이터 조회 디버그", debug_logs, "selected_isu_nm")
+def render_krx_profile_debug():
+    """KRX 헤더 프로필별 성공률/지연 지표를 화면에 디버그용으로 표시"""
+    metrics = get_krx_profile_selector().get_metrics()
+    if not metrics:
+        return
+    session_stats = get_krx_session_pool().get_stats()
+    for metric in metrics:
+        pool_stats = session_stats.get(metric["profile"], {})
+        metric["warmups"] = pool_stats.get("warmups", 0)
+        metric["invalidations"] = pool_stats.get("invalidations", 0)
 
-def render_kospi200_volatility_debug_logs(debug_logs):
-    """변동성 지수 조회 이력을 화면에 디버그용으로 표시"""
-    render_krx_debug_logs("코스피200 변동성 지수 조회 디버그", debug_logs, "selected_name")
+    metrics_df = pd.DataFrame(metrics).rename(
+        columns={
+            "host": "호스트",
+            "profile": "프로필",
+            "attempts": "시도",
+            "success_rate": "성공률(%)",
+            "avg_latency_ms": "평균지연(ms)",
+            "consecutive_failures": "연속실패",
+            "preferred": "우선",
+            "demoted": "강등",
+            "warmups": "워밍업",
+            "invalidations": "세션폐기",
+        }
+    )
+    with st.expander("KRX 헤더 프로필 디버그", expanded=False):
+        st.caption("마지막으로 성공한 프로필/타임아웃을 먼저 시도하고, 연속 실패한 프로필은 재탐색 주기 전까지 뒤로 미룹니다. 워밍업은 쿠키 수명당 1회만 수행합니다.")
+        st.dataframe(metrics_df, width="stretch", hide_index=True)
+
+def render_krx_resilience_debug():
+    """KRX 엔드포인트 회로 차단기와 최신 값 캐시 상태를 화면에 디버그용으로 표시"""
+    breaker_stats = get_krx_circuit_breaker().get_stats()
+    latest_stats = get_krx_latest_value_cache().get_stats()
+    if not breaker_stats and not latest_stats:
+        return
+
+    with st.expander("KRX 회로 차단기 / 캐시 디버그", expanded=False):
+        st.caption(
+            f"연속 {KRX_BREAKER_FAILURE_THRESHOLD}회 실패한 엔드포인트는 {KRX_BREAKER_COOLDOWN_SEC}초 동안 즉시 실패 처리하고 "
+            "이후 1건만 복구를 확인합니다. 만료된 값은 바로 보여주고 백그라운드에서 갱신하며, "
+            "유효시간은 KRX 게시 일정(다음 거래일 08시)에 맞춰 새 기준일이 나올 때만 짧아집니다."
+        )
+        if breaker_stats:
+            st.dataframe(
+                pd.DataFrame(breaker_stats).rename(
+                    columns={
+                        "endpoint": "엔드포인트",
+                        "state": "상태",
+                        "consecutive_failures": "연속실패",
+                        "trips": "차단횟수",
+                        "rejected": "즉시실패",
+                    }
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+        if latest_stats:
+            st.dataframe(
+                pd.DataFrame(latest_stats).rename(
+                    columns={
+                        "name": "항목",
+                        "state": "상태",
+                        "age_sec": "조회경과(초)",
+                        "ttl_sec": "유효시간(초)",
+                        "last_good_age_sec": "정상값경과(초)",
+                        "refreshing": "갱신중",
+                    }
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+
+def render_krx_quota_debug():
+    """KRX 호출 제한기 상태와 일일 호출 예산 사용량을 화면에 디버그용으로 표시"""
+    stats = get_krx_rate_limiter().get_stats()
+    if not stats["used"] and not stats["throttled"]:
+        return
+
+    with st.expander("KRX 호출 예산 디버그", expanded=False):
+        st.caption(
+            f"{stats['day']} 사용 {stats['used']:,} / 예산 {stats['budget']:,} · 남은 호출 {stats['remaining']:,}건 | "
+            f"초당 {KRX_RATE_LIMIT_PER_SEC:g}건(버스트 {KRX_RATE_LIMIT_BURST}) · 가용 토큰 {stats['tokens']} | "
+            f"대기 화면 {stats['waiting_interactive']} / 백그라운드 {stats['waiting_background']} · 제한 {stats['throttled']}회"
+        )
+        if stats["endpoints"]:
+            st.dataframe(
+                pd.DataFrame(stats["endpoints"]).rename(
+                    columns={
+                        "endpoint": "엔드포인트",
+                        "profile": "조회",
+                        "warmup": "워밍업",
+                        "fallback": "fallback",
+                        "total": "합계",
+                    }
+                ),
+                width="stretch",
+                hide_index=True,
+            )
+
+def render_http_pool_debug():
+    """공유 HTTP 커넥션 풀 재사용 및 요청 병합 현황을 화면에 디버그용으로 표시"""
+    stats = get_http_pool_stats()
+    single_flight_stats = get_upstream_single_flight().get_stats()
+    if not stats and not single_flight_stats:
+        return
+
+    stats_df = pd.DataFrame(stats).rename(
+        columns={
+            "host": "호스트",
+            "requests": "요청수",
+            "new_connections": "신규연결",
+            "reused": "재사용",
+        }
+    )
+    single_flight_df = pd.DataFrame(single_flight_stats).rename(
+        columns={
+            "namespace": "상류",
+            "executed": "실제호출",
+            "coalesced": "병합된호출",
+        }
+    )
+    with st.expander("HTTP 커넥션 풀 디버그", expanded=False):
+        st.caption("신규연결은 TCP+TLS 핸드셰이크 횟수, 재사용은 keep-alive 커넥션으로 처리된 요청 수입니다.")
+        st.dataframe(stats_df, width="stretch", hide_index=True)
+        st.caption("병합된호출은 진행 중인 동일 요청의 결과를 기다려 공유한 호출 수입니다.")
+        st.dataframe(single_flight_df, width="stretch", hide_index=True)
+
+def render_market_poller_debug():
+    """백그라운드 분봉 폴러 상태를 화면에 디버그용으로 표시"""
+    status = get_market_data_poller().get_status()
+    status_df = pd.DataFrame([status]).rename(
+        columns={
+            "alive": "실행중",
+            "polling_date": "갱신기준일",
+            "poll_count": "갱신횟수",
+            "last_poll_at": "마지막갱신",
+            "last_error": "마지막오류",
+        }
+    )
+    with st.expander("분봉 백그라운드 폴러 디버그", expanded=False):
+        st.caption("장중에는 폴러가 1분 봉 주기로 스냅샷을 게시하고, 화면은 게시된 스냅샷만 읽습니다.")
+        st.dataframe(status_df, width="stretch", hide_index=True)
 
 def get_valid_data(start_date):
     """
-    선택된 날짜부터 시작하여 데이터가 있는 가장 최근 평일의 데이터를 찾습니다.
-    (주말 제외, 최대 10일 검색)
+    선택된 날짜부터 시작하여 데이터가 있는 가장 최근 거래일의 데이터를 찾습니다.
+    (KRX 휴장일 제외, 최대 10거래일 검색, 후보일의 KOSPI/KOSDAQ을 제한된 동시성으로 병렬 조회)
     """
-    current_date = start_date
-    for _ in range(10): # 최대 10일 전까지 검색
-        # 주말 체크 (5: 토요일, 6: 일요일)
-        if current_date.weekday() >= 5:
-            current_date -= timedelta(days=1)
-            continue
-
-        date_str = current_date.strftime('%Y%m%d')
-        df_kospi = fetch_index_data("KOSPI", date_str)
-        df_kosdaq = fetch_index_data("KOSDAQ", date_str)
-
-        # 데이터가 하나라도 있으면 유효한 날짜로 간주
-        if not df_kospi.empty or not df_kosdaq.empty:
-            return df_kospi, df_kosdaq, date_str
+    # KRX 거래일 캘린더로 주말/공휴일을 건너뛰고, 이미 빈 응답이 확인된 날짜는 제외
+    years = (start_date.year - 1, start_date.year, start_date.year + 1)
+    kr_holiday_set = set(get_kr_holiday_dates(years))
+    empty_dates = get_empty_session_date_cache()
+    candidate_dates = [
+        date_str
+        for date_str in (
+            trading_date.strftime('%Y%m%d')
+            for trading_date in iter_previous_krx_trading_dates(start_date, VALID_DATA_MAX_SESSIONS, kr_holiday_set)
+        )
+        if date_str not in empty_dates
+    ]
 
-        # 데이터가 없으면 하루 전으로 이동
-        current_date -= timedelta(days=1)
+    # 최신 후보일부터 제출하므로 워커가 비면 가까운 날짜부터 처리됨
+    executor = make_script_thread_pool(NAVER_MAX_CONCURRENCY, "naver-index")
+    try:
+        probes = [
+            (date_str, executor.submit(load_index_frame, "KOSPI", date_str), executor.submit(load_index_frame, "KOSDAQ", date_str))
+            for date_str in candidate_dates
+        ]
+        for date_str, kospi_future, kosdaq_future in probes:
+            df_kospi, kospi_err = kospi_future.result()
+            df_kosdaq, kosdaq_err = kosdaq_future.result()
+            for error_msg in (kospi_err, kosdaq_err):
+                if error_msg:
+                    st.error(error_msg)
+
+            # 데이터가 하나라도 있으면 유효한 날짜로 간주
+            if not df_kospi.empty or not df_kosdaq.empty:
+                return df_kospi, df_kosdaq, date_str
+
+            # 마감이 지난 날짜의 정상 빈 응답은 네거티브 캐시 유효 시간 동안 다시 조회하지 않음
+            if not kospi_err and not kosdaq_err and is_intraday_session_final(date_str, datetime.now(KST_TZ)):
+                empty_dates.add(date_str)
+    finally:
+        # 더 최근 날짜가 확정되면 아직 시작하지 않은 과거 날짜 조회는 취소
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return pd.DataFrame(), pd.DataFrame(), None
 
@@ -1021,28 +2971,18 @@ def generate_full_timeline(end_time=None):
 
 def get_latest_trade_time(*dfs):
     """여러 지수 데이터프레임에서 가장 최근 체결 시각을 반환"""
-    latest_time = None
+    latest_minute = None
 
     for df in dfs:
-        if df.empty or 'thistime' not in df.columns:
-            continue
-
-        valid_times = (
-            df['thistime']
-            .dropna()
-            .astype(str)
-            .str.extract(r'(\d{12})')[0]
-            .dropna()
-        )
-        if valid_times.empty:
+        if df.empty or 'minute' not in df.columns:
             continue
+        candidate_minute = int(df['minute'].max())
+        if latest_minute is None or candidate_minute > latest_minute:
+            latest_minute = candidate_minute
 
-        latest_raw = valid_times.max()
-        candidate_time = time(int(latest_raw[8:10]), int(latest_raw[10:12]))
-        if latest_time is None or candidate_time > latest_time:
-            latest_time = candidate_time
-
-    return latest_time
+    if latest_minute is None:
+        return None
+    return time(latest_minute // 60, latest_minute % 60)
 
 def calculate_xaxis_label_interval(timeline_length):
     """타임라인 길이에 따라 X축 라벨 간격을 조정"""
@@ -1105,34 +3045,25 @@ def get_extrema_info(timeline, values):
 
 def calculate_recent_trend(df, label):
     """최근 30분(장 시작 30분 전이면 장 시작 이후 전체) 기준 추세 정보를 계산"""
-    if df.empty or "thistime" not in df.columns or "nowVal" not in df.columns:
+    if df.empty or "minute" not in df.columns or "nowVal" not in df.columns:
         return None
 
-    working = df.copy()
-    parsed_time = pd.to_datetime(
-        working["thistime"].astype(str).str.extract(r"(\d{12})")[0],
-        format="%Y%m%d%H%M",
-        errors="coerce",
-    )
-    working["parsed_time"] = parsed_time
-    working["value_num"] = pd.to_numeric(working["nowVal"], errors="coerce")
-    working = working.dropna(subset=["parsed_time", "value_num"]).sort_values("parsed_time")
-
+    # build_index_frame에서 이미 thistime 순으로 정렬된 타입 컬럼을 그대로 사용
+    working = df[["minute", "nowVal"]].dropna()
     if working.empty:
         return None
 
-    latest_row = working.iloc[-1]
-    latest_time = latest_row["parsed_time"]
-    session_open = latest_time.replace(hour=9, minute=0, second=0, microsecond=0)
-    window_start = max(session_open, latest_time - timedelta(minutes=30))
+    minutes = working["minute"].to_numpy()
+    values = working["nowVal"].to_numpy()
+    latest_minute = int(minutes[-1])
+    window_start = max(SESSION_OPEN_MINUTE, latest_minute - 30)
 
-    window_df = working.loc[working["parsed_time"] >= window_start]
-    if window_df.empty:
+    start_pos = int(np.searchsorted(minutes, window_start, side="left"))
+    if start_pos >= len(minutes):
         return None
 
-    start_row = window_df.iloc[0]
-    latest_value = float(latest_row["value_num"])
-    start_value = float(start_row["value_num"])
+    latest_value = float(values[-1])
+    start_value = float(values[start_pos])
     change_value = latest_value - start_value
     change_rate = (change_value / start_value * 100) if start_value else 0.0
 
@@ -1154,8 +3085,8 @@ def calculate_recent_trend(df, label):
         "direction": direction,
         "status_text": status_text,
         "icon": icon,
-        "start_time": start_row["parsed_time"].strftime("%H:%M"),
-        "end_time": latest_time.strftime("%H:%M"),
+        "start_time": format_minute_of_day(minutes[start_pos]),
+        "end_time": format_minute_of_day(latest_minute),
         "start_value": start_value,
         "latest_value": latest_value,
         "change_value": change_value,
@@ -1189,11 +3120,16 @@ def render_trend_card(trend):
 
 @st.fragment(run_every=60)
 def update_dashboard(selected_date):
+    # KRX 야간선물/변동성 지수 조회를 네이버 분봉 조회와 동시에 시작
+    krx_executor = make_script_thread_pool(len(KRX_PRODUCT_GROUPS), "krx-lookup")
+    krx_group_futures = {krx_executor.submit(get_latest_krx_product_group, url): url for url in KRX_PRODUCT_GROUPS}
+    krx_executor.shutdown(wait=False)
+
     with st.spinner('데이터를 불러오고 있습니다...'):
         df_kospi, df_kosdaq, actual_date_str = get_valid_data(selected_date)
 
     if df_kospi.empty and df_kosdaq.empty:
-        st.info("📌 선택한 날짜 및 이전 평일에 대한 주가 정보가 없습니다.")
+        st.info("📌 선택한 날짜 및 이전 거래일에 대한 주가 정보가 없습니다.")
         return
 
     # 날짜 표시 로직 개선
@@ -1203,29 +3139,22 @@ def update_dashboard(selected_date):
     # 전체 타임라인 생성 및 데이터 병합
     latest_trade_time = get_latest_trade_time(df_kospi, df_kosdaq)
     full_timeline = generate_full_timeline(end_time=latest_trade_time)
-    timeline_df = pd.DataFrame({'time_hm': full_timeline})
+    timeline_minutes = range(SESSION_OPEN_MINUTE, SESSION_OPEN_MINUTE + len(full_timeline))
     xaxis_interval = calculate_xaxis_label_interval(len(full_timeline))
 
-    def process_df(df, name):
+    def process_df(df):
+        # 분 단위 int64 컬럼으로 타임라인에 정렬 (같은 분의 틱은 마지막 값 사용)
         if df.empty:
-            return pd.DataFrame(columns=['time_hm', name])
-        processed_df = df.copy()
-        processed_df['time_hm'] = processed_df['thistime'].apply(lambda x: f"{x[8:10]}:{x[10:12]}")
-        return processed_df.sort_values('thistime')[['time_hm', 'nowVal']].rename(columns={'nowVal': name})
+            return [None] * len(full_timeline)
+        per_minute = df.drop_duplicates('minute', keep='last').set_index('minute')['nowVal']
+        return [clean_value(v) for v in per_minute.reindex(timeline_minutes)]
 
-    df_p_kospi = process_df(df_kospi, 'KOSPI')
-    df_p_kosdaq = process_df(df_kosdaq, 'KOSDAQ')
     kospi_trend = calculate_recent_trend(df_kospi, "KOSPI")
     kosdaq_trend = calculate_recent_trend(df_kosdaq, "KOSDAQ")
 
-    merged = pd.merge(timeline_df, df_p_kospi, on='time_hm', how='left')
-    merged = pd.merge(merged, df_p_kosdaq, on='time_hm', how='left')
-
     # 순수 숫자 리스트
-    kospi_nums = [clean_value(v) for v in merged['KOSPI']]
-    kosdaq_nums = [clean_value(v) for v in merged['KOSDAQ']]
-    kospi_nums = sanitize_series(kospi_nums)
-    kosdaq_nums = sanitize_series(kosdaq_nums)
+    kospi_nums = sanitize_series(process_df(df_kospi))
+    kosdaq_nums = sanitize_series(process_df(df_kosdaq))
 
     # 최고/최저점 좌표 계산
     k_max_info, k_min_info = get_extrema_info(full_timeline, kospi_nums)
@@ -1293,70 +3222,50 @@ def update_dashboard(selected_date):
             </div>
         """, unsafe_allow_html=True)
 
-    kospi_night_row, kospi_night_msg, kospi_night_debug_logs = get_latest_kospi_night_futures()
-    kospi200_vol_row, kospi200_vol_msg, kospi200_vol_debug_logs = get_latest_kospi200_volatility_index()
+    def render_krx_product_card(spec, result):
+        row, msg, _ = result
+        if not row:
+            render_custom_metric(spec.label, "-", "-", None, extra_info=msg or "데이터를 가져올 수 없습니다.")
+            return
+
+        extra = " | ".join(
+            format_bas_dd(row.get(field)) if field == "BAS_DD" else str(row.get(field) or "-")
+            for field in spec.extra_fields
+        )
+        if msg:
+            extra = f"{extra}<br>{msg}"
+        change_rate = normalize_change_rate_text(row.get(spec.rate_field)) if spec.rate_field else None
+        if change_rate is None:
+            change_rate = calculate_change_rate_from_close_and_delta(
+                row.get(spec.value_field),
+                row.get(spec.change_field),
+            )
+        render_custom_metric(
+            spec.label,
+            format_metric_number(row.get(spec.value_field)),
+            format_metric_number(row.get(spec.change_field)),
+            change_rate,
+            extra_info=extra,
+        )
 
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, *krx_cols = st.columns(2 + len(KRX_PRODUCTS))
     with col1:
         if not df_kospi.empty:
-            curr = df_kospi.sort_values('thistime', ascending=False).iloc[0]
-            render_custom_metric("KOSPI 현재가", f"{float(curr['nowVal']):,.2f}", curr['changeVal'], curr['changeRate'], k_max_info, k_min_info)
+            curr = df_kospi.iloc[-1]
+            render_custom_metric("KOSPI 현재가", f"{curr['nowVal']:,.2f}", format_metric_number(curr['changeVal']), normalize_change_rate_text(curr['changeRate']), k_max_info, k_min_info)
     with col2:
         if not df_kosdaq.empty:
-            curr = df_kosdaq.sort_values('thistime', ascending=False).iloc[0]
-            render_custom_metric("KOSDAQ 현재가", f"{float(curr['nowVal']):,.2f}", curr['changeVal'], curr['changeRate'], q_max_info, q_min_info)
-    with col3:
-        if kospi_night_row:
-            bas_dd_text = format_bas_dd(kospi_night_row.get("BAS_DD"))
-            prod_nm = str(kospi_night_row.get("PROD_NM") or "-")
-            mkt_nm = str(kospi_night_row.get("MKT_NM") or "-")
-            extra = f"{bas_dd_text} | {prod_nm} | {mkt_nm}"
-            change_rate = calculate_change_rate_from_close_and_delta(
-                kospi_night_row.get("TDD_CLSPRC"),
-                kospi_night_row.get("CMPPREVDD_PRC"),
-            )
-            render_custom_metric(
-                "KOSPI 200 야간선물",
-                format_metric_number(kospi_night_row.get("TDD_CLSPRC")),
-                format_metric_number(kospi_night_row.get("CMPPREVDD_PRC")),
-                change_rate,
-                extra_info=extra,
-            )
-        else:
-            render_custom_metric(
-                "KOSPI 200 야간선물",
-                "-",
-                "-",
-                None,
-                extra_info=kospi_night_msg or "데이터를 가져올 수 없습니다.",
-            )
-    with col4:
-        if kospi200_vol_row:
-            bas_dd_text = format_bas_dd(kospi200_vol_row.get("BAS_DD"))
-            idx_clss = str(kospi200_vol_row.get("IDX_CLSS") or "-")
-            idx_nm = str(kospi200_vol_row.get("IDX_NM") or "-")
-            extra = f"{bas_dd_text} | {idx_clss} | {idx_nm}"
-            change_rate = normalize_change_rate_text(kospi200_vol_row.get("FLUC_RT"))
-            if change_rate is None:
-                change_rate = calculate_change_rate_from_close_and_delta(
-                    kospi200_vol_row.get("CLSPRC_IDX"),
-                    kospi200_vol_row.get("CMPPREVDD_IDX"),
-                )
-            render_custom_metric(
-                "KOSPI 200 변동성 지수",
-                format_metric_number(kospi200_vol_row.get("CLSPRC_IDX")),
-                format_metric_number(kospi200_vol_row.get("CMPPREVDD_IDX")),
-                change_rate,
-                extra_info=extra,
-            )
-        else:
-            render_custom_metric(
-                "KOSPI 200 변동성 지수",
-                "-",
-                "-",
-                None,
-                extra_info=kospi200_vol_msg or "데이터를 가져올 수 없습니다.",
-            )
+            curr = df_kosdaq.iloc[-1]
+            render_custom_metric("KOSDAQ 현재가", f"{curr['nowVal']:,.2f}", format_metric_number(curr['changeVal']), normalize_change_rate_text(curr['changeRate']), q_max_info, q_min_info)
+
+    # KRX 카드는 자리만 잡아두고 차트를 먼저 그린 뒤, 끝나는 순서대로 채움
+    krx_slots = {}
+    for column, spec in zip(krx_cols, KRX_PRODUCTS.values()):
+        with column:
+            slot = st.empty()
+        with slot.container():
+            render_custom_metric(spec.label, "-", "-", None, extra_info="KRX 데이터를 불러오는 중입니다...")
+        krx_slots[spec.key] = slot
 
     trend_col1, trend_col2 = st.columns(2)
     with trend_col1:
@@ -1508,8 +3417,25 @@ def update_dashboard(selected_date):
         theme="light",
     )
 
-    render_kospi_night_debug_logs(kospi_night_debug_logs)
-    render_kospi200_volatility_debug_logs(kospi200_vol_debug_logs)
+    krx_results = {}
+    for future in as_completed(krx_group_futures):
+        specs, _ = KRX_PRODUCT_GROUPS[krx_group_futures[future]]
+        try:
+            group_results = future.result()
+        except Exception as e:
+            group_results = {spec.key: (None, f"KRX 조회 중 오류 발생: {e}", []) for spec in specs}
+        for spec in specs:
+            with krx_slots[spec.key].container():
+                render_krx_product_card(spec, group_results[spec.key])
+        krx_results.update(group_results)
+
+    for spec in KRX_PRODUCTS.values():
+        render_krx_debug_logs(f"{spec.label} 조회 디버그", krx_results[spec.key][2])
+    render_krx_profile_debug()
+    render_krx_resilience_debug()
+    render_krx_quota_debug()
+    render_http_pool_debug()
+    render_market_poller_debug()
 
 def main():
     # Hero Section
@@ -1524,6 +3450,7 @@ def main():
     now_kst = datetime.now(KST_TZ)
     today = now_kst.date()
     countdown_context = get_market_countdown_context(now_kst)
+    get_market_data_poller()
 
     # 세션 상태 초기화
     if 'selected_date' not in st.session_state:
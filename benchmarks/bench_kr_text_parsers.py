@@ -0,0 +1,181 @@
+"""
+KRX 텍스트/계약월 파서 마이크로 벤치마크.
+
+fut_bydd_trd 응답과 같은 구성(지수/주식/금리/통화 선물, 정규/야간, 스프레드 종목)의
+고정 시드 픽스처로 행당 비용을 기존 구현(호출마다 re 조회, 메모 없음)과 현재 app.py 구현으로 비교합니다.
+
+    python benchmarks/bench_kr_text_parsers.py --rows 3000 --repeat 7
+"""
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.WARNING)
+
+import app  # noqa: E402
+
+STOCK_NAMES = [
+    "삼성전자", "SK하이닉스", "LG에너지솔루션", "삼성바이오로직스", "현대차", "기아", "셀트리온", "POSCO홀딩스",
+    "NAVER", "카카오", "LG화학", "삼성SDI", "KB금융", "신한지주", "현대모비스", "삼성물산", "하나금융지주",
+    "LG전자", "SK이노베이션", "한국전력", "삼성생명", "HMM", "대한항공", "두산에너빌리티", "한화에어로스페이스",
+]
+INDEX_PRODUCTS = [
+    ("코스피200 선물", "코스피200 F"),
+    ("미니코스피200 선물", "미니코스피200 F"),
+    ("코스닥150 선물", "코스닥150 F"),
+    ("KRX300 선물", "KRX300 F"),
+    ("코스피200 섹터지수 선물", "코스피200 에너지/화학 F"),
+]
+RATE_FX_PRODUCTS = [
+    ("3년국채 선물", "3년국채 F"),
+    ("10년국채 선물", "10년국채 F"),
+    ("미국달러 선물", "미국달러 F"),
+    ("엔 선물", "엔 F"),
+]
+
+
+def build_fut_bydd_trd_fixture(row_count, bas_dd="20261016", seed=20261016):
+    """fut_bydd_trd 한 기준일 응답과 비슷한 행 목록 (같은 상품/종목명이 월물마다 반복)"""
+    rng = random.Random(seed)
+    months = ["202611", "202612", "202701", "202703", "202706", "202709", "202712"]
+    templates = []
+    for prod_nm, isu_prefix in INDEX_PRODUCTS:
+        for month in months:
+            templates.append((prod_nm, "정규", f"{isu_prefix} {month}"))
+            templates.append((prod_nm, "야간", f"{isu_prefix} {month} (야간)"))
+        for near, far in zip(months, months[1:]):
+            templates.append((prod_nm, "정규", f"{isu_prefix.replace(' F', ' SP')} {near[2:]}-{far[2:]}"))
+    for prod_nm, isu_prefix in RATE_FX_PRODUCTS:
+        for month in months[:4]:
+            templates.append((prod_nm, "정규", f"{isu_prefix} {month}"))
+    for stock_nm in STOCK_NAMES:
+        for month in months[:4]:
+            templates.append(("주식선물", "정규", f"{stock_nm} F {month}"))
+
+    rows = []
+    for position in range(row_count):
+        prod_nm, mkt_nm, isu_nm = templates[position % len(templates)]
+        close = round(rng.uniform(50, 900), 2)
+        rows.append({
+            "BAS_DD": bas_dd,
+            "ISU_CD": f"1{position:08d}",
+            "ISU_NM": isu_nm,
+            "PROD_NM": prod_nm,
+            "MKT_NM": mkt_nm,
+            "TDD_CLSPRC": f"{close:.2f}",
+            "CMPPREVDD_PRC": f"{rng.uniform(-5, 5):.2f}",
+            "ACC_TRDVOL": str(rng.randint(0, 200000)),
+            "ACC_OPNINT_QTY": str(rng.randint(0, 400000)),
+        })
+    return rows
+
+
+# 기존 구현: 호출마다 패턴 문자열로 re 모듈 캐시를 조회하고 결과를 메모하지 않음
+def baseline_normalize_kr_text(value):
+    return re.sub(r"\s+", "", str(value or "")).strip()
+
+
+def baseline_parse_yyyymm_contract(value):
+    text = baseline_normalize_kr_text(value)
+    match = re.search(r"(20\d{2})[-./]?(0[1-9]|1[0-2])", text)
+    if match:
+        return int(f"{match.group(1)}{match.group(2)}")
+    match = re.search(r"(?<!\d)(\d{2})(0[1-9]|1[0-2])(?!\d)", text)
+    if match:
+        return int(f"20{match.group(1)}{match.group(2)}")
+    match = re.search(r"((?:20)?\d{2})년\s*([1-9]|1[0-2])월", text)
+    if match:
+        year = match.group(1)
+        if len(year) == 2:
+            year = f"20{year}"
+        return int(f"{year}{int(match.group(2)):02d}")
+    return None
+
+
+def baseline_normalize_bas_dd(value):
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) >= 8:
+        return int(digits[:8])
+    return 0
+
+
+def baseline_format_bas_dd(value):
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) >= 8:
+        return f"{digits[:4]}-{digits[4:6]}-{digits[6:8]}"
+    return str(value) if value is not None else "-"
+
+
+def parse_rows(rows, normalize_kr_text, parse_yyyymm_contract, normalize_bas_dd, format_bas_dd):
+    """행마다 필터/선택 경로에서 쓰는 파서 호출 묶음"""
+    for row in rows:
+        normalize_kr_text(row["PROD_NM"])
+        normalize_kr_text(row["MKT_NM"])
+        parse_yyyymm_contract(row["ISU_NM"])
+        normalize_bas_dd(row["BAS_DD"])
+        format_bas_dd(row["BAS_DD"])
+
+
+def clear_parser_caches():
+    app._normalize_kr_text_cached.cache_clear()
+    app._parse_yyyymm_contract_cached.cache_clear()
+    app._bas_dd_digits_cached.cache_clear()
+
+
+def per_row_ns(fn, rows, repeat, before_each=None):
+    def run():
+        if before_each is not None:
+            before_each()
+        fn(rows)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(rows) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    rows = build_fut_bydd_trd_fixture(args.rows)
+    baseline = lambda items: parse_rows(
+        items,
+        baseline_normalize_kr_text,
+        baseline_parse_yyyymm_contract,
+        baseline_normalize_bas_dd,
+        baseline_format_bas_dd,
+    )
+    current = lambda items: parse_rows(
+        items,
+        app.normalize_kr_text,
+        app.parse_yyyymm_contract,
+        app.normalize_bas_dd,
+        app.format_bas_dd,
+    )
+
+    for row in rows:
+        assert app.normalize_kr_text(row["ISU_NM"]) == baseline_normalize_kr_text(row["ISU_NM"])
+        assert app.parse_yyyymm_contract(row["ISU_NM"]) == baseline_parse_yyyymm_contract(row["ISU_NM"])
+        assert app.format_bas_dd(row["BAS_DD"]) == baseline_format_bas_dd(row["BAS_DD"])
+
+    distinct = len({(row["PROD_NM"], row["MKT_NM"], row["ISU_NM"]) for row in rows})
+    baseline_ns = per_row_ns(baseline, rows, args.repeat)
+    cold_ns = per_row_ns(current, rows, args.repeat, before_each=clear_parser_caches)
+    clear_parser_caches()
+    current(rows)
+    warm_ns = per_row_ns(current, rows, args.repeat)
+
+    print(f"fut_bydd_trd 픽스처: {len(rows):,}행, 고유 (PROD_NM, MKT_NM, ISU_NM) {distinct}개")
+    print(f"기존 (re 조회, 메모 없음)  : {baseline_ns:8.0f} ns/행")
+    print(f"현재 (컴파일+메모, 빈 캐시): {cold_ns:8.0f} ns/행  ({baseline_ns / cold_ns:.1f}x)")
+    print(f"현재 (컴파일+메모, 채운 캐시): {warm_ns:8.0f} ns/행  ({baseline_ns / warm_ns:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()